@@ -0,0 +1,264 @@
+"""
+Benchmark fetching, searching and downloading against a local mock server
+
+Usage ::
+
+    python -m benchmarks.bench_download
+    python -m benchmarks.bench_download --latency 0.05 --bandwidth 2097152 --workers 8
+
+Save the results, and compare later runs with them ::
+
+    python -m benchmarks.bench_download --save baseline.json
+    python -m benchmarks.bench_download --compare baseline.json --tolerance 0.1
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import mangabat_dl
+from mangabat_dl import MangabatDownloader, fetcher
+from .mock_server import MockServer
+
+def percentile(values, percent):
+    values = sorted(values)
+    index = min(int(round(percent / 100 * (len(values) - 1))), len(values) - 1)
+    return values[index]
+
+def bench(func, number):
+    """Run `func` for `number` times, return latencies, peak memory and result of last run"""
+    latencies = []
+    for _ in range(number):
+        start = time.perf_counter()
+        result = func()
+        latencies.append(time.perf_counter() - start)
+
+    # tracemalloc slows down everything, measure memory in separate run
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return latencies, peak, result
+
+def report(name, latencies, peak, size=None, items=None):
+    """Print a row of results, return them as dict which can be saved as JSON"""
+    total = sum(latencies)
+    if size is not None:
+        throughput = size * len(latencies) / total / 1024 / 1024
+        unit = 'MB/s'
+    elif items is not None:
+        throughput = items * len(latencies) / total
+        unit = 'it/s'
+    else:
+        throughput = len(latencies) / total
+        unit = 'op/s'
+    result = {
+        'runs': len(latencies),
+        'mean': statistics.mean(latencies),
+        'p50': percentile(latencies, 50),
+        'p90': percentile(latencies, 90),
+        'p99': percentile(latencies, 99),
+        'throughput': throughput,
+        'unit': unit,
+        'peak': peak
+    }
+    print('%-18s %5s %9.1f %9.1f %9.1f %9.1f %8.2f %s %9.2f' % (
+        name,
+        result['runs'],
+        result['mean'] * 1000,
+        result['p50'] * 1000,
+        result['p90'] * 1000,
+        result['p99'] * 1000,
+        throughput,
+        unit,
+        peak / 1024 / 1024
+    ))
+    return result
+
+def compare(cases, baseline, tolerance):
+    """
+    Compare results of cases with baseline, a case is regressed
+    when median latency or peak memory is more than `tolerance` above the baseline.
+    Cases which are not in both of them are ignored.
+
+    return names of regressed cases
+    """
+    regressed = []
+    print('%-18s %12s %12s %8s %12s %12s %8s' % (
+        'case', 'base p50 ms', 'p50 ms', 'change', 'base peak MB', 'peak MB', 'change'
+    ))
+    for name, result in cases.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        latency_change = result['p50'] / base['p50'] - 1 if base['p50'] else 0.0
+        peak_change = result['peak'] / base['peak'] - 1 if base['peak'] else 0.0
+        failed = latency_change > tolerance or peak_change > tolerance
+        if failed:
+            regressed.append(name)
+        print('%-18s %12.1f %12.1f %+7.1f%% %12.2f %12.2f %+7.1f%%%s' % (
+            name,
+            base['p50'] * 1000,
+            result['p50'] * 1000,
+            latency_change * 100,
+            base['peak'] / 1024 / 1024,
+            result['peak'] / 1024 / 1024,
+            peak_change * 100,
+            '  REGRESSED' if failed else ''
+        ))
+    return regressed
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark mangabat-dl against a local mock server')
+    parser.add_argument('--number', '-n', type=int, default=10, help='Number of runs for each case')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds before every response')
+    parser.add_argument('--bandwidth', type=int, default=0, help='Bytes per second of every response, 0 means no limit')
+    parser.add_argument('--chapters', type=int, default=10, help='Number of chapters in manga')
+    parser.add_argument('--pages', type=int, default=10, help='Number of pages in chapter')
+    parser.add_argument('--image-size', type=int, default=100 * 1024, help='Size of every page in bytes')
+    parser.add_argument('--search-pages', type=int, default=5, help='Number of search result pages')
+    parser.add_argument('--workers', '-w', type=int, default=4, help='Number of pages downloaded at the same time')
+    parser.add_argument('--transfer-mode', choices=['tuned', 'legacy'], default='tuned')
+    parser.add_argument('--parser', choices=['lxml', 'bs4'])
+    parser.add_argument(
+        '--processes',
+        type=int,
+        help='Also benchmark Crawler.fetch_many with given number of parse processes'
+    )
+    parser.add_argument('--save', metavar='FILE', help='Write results to given JSON file')
+    parser.add_argument(
+        '--compare',
+        metavar='FILE',
+        help='Compare results with given JSON file from --save, exit with status 1 if any case is regressed'
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.1,
+        help='Allowed slowdown and memory growth for --compare, 0.1 means 10%% (default)'
+    )
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare is not None:
+        # Fail before running the benchmarks
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+
+    fetcher.set_parser(args.parser)
+    server = MockServer(
+        latency=args.latency,
+        bandwidth=args.bandwidth,
+        chapters=args.chapters,
+        pages=args.pages,
+        image_size=args.image_size,
+        search_pages=args.search_pages
+    )
+    cases = {}
+    cwd = os.getcwd()
+    with server, tempfile.TemporaryDirectory() as folder:
+        # Download into the temporary folder
+        os.chdir(folder)
+        try:
+            session = MangabatDownloader(args.workers, transfer_mode=args.transfer_mode)
+            manga_url = server.url + '/bench'
+            manga = mangabat_dl.fetch(manga_url, session)
+            chapter = manga.chapters[0]
+            chapter_size = args.pages * len(server.image)
+
+            print('parser: %s, transfer mode: %s, workers: %s, latency: %ss, bandwidth: %s B/s' % (
+                fetcher.get_parser(),
+                args.transfer_mode,
+                args.workers,
+                args.latency,
+                args.bandwidth or 'unlimited'
+            ))
+            print('%-18s %5s %9s %9s %9s %9s %13s %9s' % (
+                'case', 'runs', 'mean ms', 'p50 ms', 'p90 ms', 'p99 ms', 'throughput', 'peak MB'
+            ))
+
+            latencies, peak, _ = bench(lambda: mangabat_dl.fetch(manga_url, session), args.number)
+            cases['fetch'] = report('fetch', latencies, peak)
+
+            urls = [server.url + '/bench-%s' % i for i in range(args.workers * 4)]
+            latencies, peak, _ = bench(lambda: list(mangabat_dl.fetch_many(urls, args.workers, session)), args.number)
+            cases['fetch_many'] = report('fetch_many', latencies, peak, items=len(urls))
+
+            if args.processes is not None:
+                with mangabat_dl.Crawler(args.workers, args.processes, session) as crawler:
+                    # Start the processes before measuring
+                    crawler.fetch(manga_url)
+                    latencies, peak, _ = bench(lambda: list(crawler.fetch_many(urls)), args.number)
+                cases['Crawler.fetch_many'] = report('Crawler.fetch_many', latencies, peak, items=len(urls))
+
+            latencies, peak, results = bench(
+                lambda: mangabat_dl.search_all('bench', session, args.workers),
+                args.number
+            )
+            cases['search_all'] = report('search_all', latencies, peak, items=len(results))
+
+            def download_chapter():
+                # Chapter pages are fetched again in every run
+                chapter._cached_pages = None
+                return chapter.download(
+                    progress_bar=False,
+                    replace=True,
+                    workers=args.workers,
+                    session=session
+                )
+            latencies, peak, _ = bench(download_chapter, args.number)
+            cases['Chapter.download'] = report('Chapter.download', latencies, peak, size=chapter_size)
+
+            def download_manga():
+                for chap in manga.chapters:
+                    chap._cached_pages = None
+                return manga.download(
+                    progress_bar=False,
+                    replace=True,
+                    workers=args.workers,
+                    session=session
+                )
+            latencies, peak, _ = bench(download_manga, max(args.number // 5, 1))
+            cases['Manga.download'] = report('Manga.download', latencies, peak, size=chapter_size * args.chapters)
+
+            session.close()
+            print('%s requests served' % server.requests)
+        finally:
+            os.chdir(cwd)
+
+    config = {
+        'parser': fetcher.get_parser(),
+        'transfer_mode': args.transfer_mode,
+        'workers': args.workers,
+        'latency': args.latency,
+        'bandwidth': args.bandwidth,
+        'chapters': args.chapters,
+        'pages': args.pages,
+        'image_size': args.image_size,
+        'search_pages': args.search_pages
+    }
+    if args.save is not None:
+        with open(args.save, 'w') as f:
+            json.dump({'config': config, 'cases': cases}, f, indent=4)
+
+    if baseline is not None:
+        print()
+        if baseline['config'] != config:
+            print('warning: baseline was run with different options: %s' % baseline['config'])
+        regressed = compare(cases, baseline['cases'], args.tolerance)
+        if regressed:
+            print('%s case(s) regressed more than %s%%: %s' % (
+                len(regressed),
+                args.tolerance * 100,
+                ', '.join(regressed)
+            ))
+            sys.exit(1)
+        print('no regressions')
+
+if __name__ == '__main__':
+    main()
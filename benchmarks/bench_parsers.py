@@ -0,0 +1,55 @@
+"""
+Compare HTML parsers of fetcher.py
+
+Usage ::
+
+    python -m benchmarks.bench_parsers
+"""
+import argparse
+import time
+from mangabat_dl import fetcher
+from mangabat_dl.lxml_parser import lxml
+from . import fixtures
+
+BASE = 'https://m.mangabat.com'
+
+def bench(func, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        result = func()
+    return (time.perf_counter() - start) / number, result
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark HTML parsers')
+    parser.add_argument('--number', '-n', type=int, default=20, help='Number of runs for each page')
+    parser.add_argument('--chapters', type=int, default=500, help='Number of chapters in manga page')
+    args = parser.parse_args()
+
+    manga = fixtures.manga_page(BASE, 'bench', args.chapters)
+    chapter = fixtures.chapter_page(BASE, 'bench', 1)
+    search = fixtures.search_page(BASE, 'bench')
+
+    cases = [
+        ('manga page', lambda: fetcher._parse_manga(manga)),
+        ('chapter page', lambda: fetcher._parse_chapter_images(chapter)),
+        ('search page', lambda: fetcher._parse_search_first_page(search, 'bench')),
+    ]
+    parsers = ['bs4'] if lxml is None else ['bs4', 'lxml']
+
+    print('%-14s %-8s %12s %10s' % ('page', 'parser', 'ms/page', 'speedup'))
+    for name, func in cases:
+        baseline = None
+        expected = None
+        for parser_name in parsers:
+            fetcher.set_parser(parser_name)
+            seconds, result = bench(func, args.number)
+            if baseline is None:
+                baseline = seconds
+                expected = result
+            elif result != expected:
+                raise AssertionError('%s parser returned different result for %s' % (parser_name, name))
+            print('%-14s %-8s %12.3f %9.1fx' % (name, parser_name, seconds * 1000, baseline / seconds))
+    fetcher.set_parser(None)
+
+if __name__ == '__main__':
+    main()
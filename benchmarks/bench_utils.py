@@ -0,0 +1,149 @@
+"""
+Compare convert_query_search and filter_forbidden_names of utils.py
+against the previous implementations, and check that the results are the same
+
+Usage ::
+
+    python -m benchmarks.bench_utils
+"""
+import argparse
+import random
+import re
+import time
+from mangabat_dl import utils
+
+# Previous implementations, kept as they were
+
+def legacy_convert_query_search(query_search: str):
+    string = query_search.lower()
+    REGEXS_CONVERT_ALIAS = [
+        [re.compile(r'à|á|ạ|ả|ã|â|ầ|ấ|ậ|ẩ|ẫ|ă|ằ|ắ|ặ|ẳ|ẵ'), "a"],
+        [re.compile(r'è|é|ẹ|ẻ|ẽ|ê|ề|ế|ệ|ể|ễ'), "e"],
+        [re.compile(r'ì|í|ị|ỉ|ĩ'), "i"],
+        [re.compile(r'ò|ó|ọ|ỏ|õ|ô|ồ|ố|ộ|ổ|ỗ|ơ|ờ|ớ|ợ|ở|ỡ'), "o"],
+        [re.compile(r'ù|ú|ụ|ủ|ũ|ư|ừ|ứ|ự|ử|ữ'), "u"],
+        [re.compile(r'ỳ|ý|ỵ|ỷ|ỹ'), "y"],
+        [re.compile(r'đ'), "d"],
+        [re.compile(r' '), "_"],
+        [re.compile(r'[^0-9a-z\s]', re.IGNORECASE), '_'],
+        [re.compile(r'_+_'), '_'],
+        [re.compile(r'^\_+|\_+$'), '']
+    ]
+    alias = utils.ContextVar(string)
+    for context in REGEXS_CONVERT_ALIAS:
+        regex = context[0]
+        replacer = context[1]
+        result = regex.sub(replacer, alias.get())
+        alias.set(result)
+    return alias.get()
+
+def legacy_filter_forbidden_names(string: str):
+    result = ''
+    UNIX_FORBIDDEN_NAMES = ['/']
+    MAC_OS_FORBIDDEN_NAMES = [':']
+    WINDOWS_FORBIDDEN_NAMES = ['<', '>', ':', '\"', '/', '\\', '|', '?', '*']
+    for word in string:
+        if word in UNIX_FORBIDDEN_NAMES:
+            continue
+        elif word in MAC_OS_FORBIDDEN_NAMES:
+            continue
+        elif word in WINDOWS_FORBIDDEN_NAMES:
+            continue
+        else:
+            result += word
+    final = utils.StringVar(result)
+    while True:
+        ctx = final.get()
+        if ctx[len(ctx) - 1] == '.' or ctx[len(ctx) - 1] == ' ':
+            r = ctx[0:len(ctx) - 1]
+            final.set(r)
+        else:
+            break
+    return final.get()
+
+ALPHABET = (
+    'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+    '   ___...---!?:/\\<>"|*\t\n'
+    'àáạảãâầấậẩẫăằắặẳẵèéẹẻẽêềếệểễìíịỉĩòóọỏõôồốộổỗơờớợởỡùúụủũưừứựửữỳýỵỷỹđ'
+    'ÀÁẠĐÊÔƠƯÝ'
+    'ſıİKß日本語한국어'
+)
+
+SAMPLES = [
+    'Tensei Shitara Slime Datta Ken',
+    'Kimetsu no Yaiba: Tanjirou Kamado, Ukon no Shou',
+    'Hà Nội Đẹp Lắm!',
+    '  __One Piece__  ',
+    'Re:Zero - Kara Hajimeru Isekai Seikatsu...',
+    'Chapter 1: "What?" <Part 1/2> | Done. . ',
+    'Vol.3 Chapter 20.5 : *Extra*',
+]
+
+def random_samples(count, seed=0):
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(count):
+        name = ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 60)))
+        # Previous filter_forbidden_names fails on empty result
+        if name.strip('/:<>"\\|?*. '):
+            samples.append(name)
+    return samples
+
+def check(name, func, legacy, samples):
+    for sample in samples:
+        if func(sample) != legacy(sample):
+            raise AssertionError('%s returned different result for %r: %r != %r' % (
+                name,
+                sample,
+                func(sample),
+                legacy(sample)
+            ))
+
+def bench(func, samples, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        for sample in samples:
+            func(sample)
+    return (time.perf_counter() - start) / (number * len(samples))
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark utils.py string functions')
+    parser.add_argument('--number', '-n', type=int, default=200, help='Number of runs over all samples')
+    parser.add_argument('--samples', type=int, default=5000, help='Number of random samples checked')
+    args = parser.parse_args()
+
+    samples = SAMPLES + random_samples(args.samples)
+    cases = [
+        (
+            'convert_query_search',
+            utils.convert_query_search,
+            legacy_convert_query_search
+        ),
+        (
+            'filter_forbidden_names',
+            utils.filter_forbidden_names,
+            legacy_filter_forbidden_names
+        ),
+        (
+            # Without lru_cache, as if every name is new
+            'filter_forbidden_names (uncached)',
+            utils.filter_forbidden_names.__wrapped__,
+            legacy_filter_forbidden_names
+        ),
+    ]
+
+    print('%-34s %12s %12s %10s' % ('function', 'legacy us', 'current us', 'speedup'))
+    for name, func, legacy in cases:
+        check(name, func, legacy, samples)
+        legacy_seconds = bench(legacy, SAMPLES, args.number)
+        seconds = bench(func, SAMPLES, args.number)
+        print('%-34s %12.2f %12.2f %9.1fx' % (
+            name,
+            legacy_seconds * 1000000,
+            seconds * 1000000,
+            legacy_seconds / seconds
+        ))
+    print('%s samples checked, results are the same' % len(samples))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+# Synthetic mangabat pages, with the same structure that fetcher.py parses.
+# `base` is the url where the pages are served, see benchmarks/mock_server.py
+
+_BOILERPLATE = ''.join(
+    '<div class="panel-item"><a href="/genre-%d" title="Genre %d">Genre %d</a>'
+    '<script>var x%d = "%s";</script><!-- ad slot %d --></div>' % (i, i, i, i, 'x' * 40, i)
+    for i in range(200)
+)
+
+def manga_page(base, slug, chapters=100):
+    chapters_html = ''.join(
+        '<li class="a-h"><a rel="nofollow" class="chapter-name text-nowrap" '
+        'href="%s/%s/chap-%s" title="Manga %s chapter %s">Chapter %s: Tom &amp; Jerry</a>'
+        '<span class="chapter-view text-nowrap">1,234</span>'
+        '<span class="chapter-time text-nowrap" title="Jan 02,2021 10:00">Jan 02,21</span></li>' % (
+            base, slug, i, slug, i, i
+        ) for i in range(chapters, 0, -1)
+    )
+    return (
+        '<!DOCTYPE html><html><head><meta charset="UTF-8">'
+        '<link rel="canonical" href="%(base)s/%(slug)s"/>'
+        '<meta property="og:description" content="Short description of %(slug)s"/>'
+        '</head><body><div class="body-site">%(boilerplate)s'
+        '<div class="panel-story-info"><div class="story-info-left">'
+        '<span class="info-image"><img class="img-loading" src="%(base)s/cover/%(slug)s.jpg" alt="cover"/>'
+        '<em class="item-hot"></em></span></div>'
+        '<div class="story-info-right"><h1>Manga %(slug)s &amp; Friends</h1>'
+        '<table class="variations-tableInfo"><tbody>'
+        '<tr><td class="table-label">Alternative :</td>'
+        '<td class="table-value"><h2>Alt One ; Alt Two ; Alt Three</h2></td></tr>'
+        '<tr><td class="table-label">Author(s) :</td>'
+        '<td class="table-value"><a class="a-h" href="%(base)s/author/1">Author One</a> - '
+        '<a class="a-h" href="%(base)s/author/2">Author Two</a></td></tr>'
+        '<tr><td class="table-label">Status :</td><td class="table-value">Ongoing</td></tr>'
+        '<tr><td class="table-label">Genres :</td><td class="table-value">'
+        '<a class="a-h" href="%(base)s/genre/1">Action</a> - <a class="a-h" href="%(base)s/genre/2">Comedy</a>'
+        '</td></tr></tbody></table>'
+        '<div class="story-info-right-extent">'
+        '<p><span class="stre-label"><i class="info-time"></i>Updated :</span>'
+        '<span class="stre-value">Jan 02,2021 - 10:00 AM</span></p>'
+        '<p><span class="stre-label"><i class="info-view"></i>View :</span>'
+        '<span class="stre-value">1,234,567</span></p></div></div>'
+        '<div class="panel-story-info-description" id="panel-story-info-description">'
+        '<h3>Description :</h3>Long description of <b>%(slug)s</b> &amp; more.<!-- comment --></div>'
+        '</div><div class="panel-story-chapter-list"><ul class="row-content-chapter">%(chapters)s</ul></div>'
+        '%(boilerplate)s</div></body></html>'
+    ) % {
+        'base': base,
+        'slug': slug,
+        'chapters': chapters_html,
+        'boilerplate': _BOILERPLATE
+    }
+
+def chapter_page(base, slug, chapter, pages=40):
+    images = ''.join(
+        '<img src="%s/img/%s/%s/%s.jpg" alt="page %s" title="page %s"/>' % (
+            base, slug, chapter, i, i, i
+        ) for i in range(1, pages + 1)
+    )
+    return (
+        '<!DOCTYPE html><html><head><meta charset="UTF-8"></head><body>%s'
+        '<div class="container-chapter-reader">%s</div>%s</body></html>'
+    ) % (_BOILERPLATE, images, _BOILERPLATE)
+
+def search_page(base, query, page=1, last_page=5, results=20):
+    items = ''.join(
+        '<div class="list-story-item bookmark_check cover" data-id="%(id)s">'
+        '<a class="item-img bookmark_check" href="%(base)s/manga-%(id)s" title="Manga %(id)s">'
+        '<img class="img-loading" src="%(base)s/cover/%(id)s.jpg" alt="Manga %(id)s"/>'
+        '<em class="item-hot"></em><em class="item-rate">4.5</em></a>'
+        '<div class="item-right"><h3><a class="item-title" href="%(base)s/manga-%(id)s">Manga %(id)s</a></h3>'
+        '<a class="item-chapter a-h text-nowrap" href="%(base)s/manga-%(id)s/chap-2" title="Chapter 2">Chapter 2</a>'
+        '<a class="item-chapter a-h text-nowrap" href="%(base)s/manga-%(id)s/chap-1" title="Chapter 1">Chapter 1</a>'
+        '<span class="text-nowrap item-author" title="Author One, Author Two">Author One, Author Two</span>'
+        '<span class="text-nowrap item-time">Updated : Jan 01,2021 - 10:00</span>'
+        '<span class="text-nowrap item-time">View : 12,345</span></div></div>' % {
+            'base': base,
+            'id': '%s-%s-%s' % (query, page, i)
+        } for i in range(results)
+    )
+    pages = '<div class="group-page"><a class="page-blue page-first" href="%s/search/manga/%s">First(1)</a>' % (base, query)
+    for i in range(1, last_page):
+        if i == page:
+            pages += '<a class="page-blue">%s</a>' % i
+        else:
+            pages += '<a href="%s/search/manga/%s?page=%s">%s</a>' % (base, query, i, i)
+    pages += '<a class="page-blue page-last" href="%s/search/manga/%s?page=%s">Last(%s)</a></div>' % (
+        base, query, last_page, last_page
+    )
+    return (
+        '<!DOCTYPE html><html><head><meta charset="UTF-8"></head><body>%s'
+        '<div class="panel-list-story">%s</div>%s%s</body></html>'
+    ) % (_BOILERPLATE, items, pages, _BOILERPLATE)
+
+def image(size=100 * 1024):
+    data = bytes(range(256)) * (size // 256 + 1)
+    return b'\xff\xd8\xff\xe0' + data[:size - 4]
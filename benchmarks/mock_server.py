@@ -0,0 +1,192 @@
+"""
+Local HTTP stand-in of mangabat, serving pages from benchmarks/fixtures.py
+
+Served paths ::
+
+    /search/manga/<query>[?page=N]    search pages
+    /<slug>                           manga page
+    /<slug>/chap-<N>                  chapter page
+    /img/<slug>/<chapter>/<page>.jpg  page images (supports Range and If-Range)
+    /cover/<slug>.jpg                 cover images
+
+Usage ::
+
+    with MockServer(latency=0.05, bandwidth=10 * 1024 * 1024) as server:
+        manga = mangabat_dl.fetch(server.url + '/bench')
+"""
+import functools
+import hashlib
+import http.server
+import re
+import socketserver
+import sys
+import threading
+import time
+import urllib.parse
+from mangabat_dl import fetcher
+from . import fixtures
+
+_REGEX_SEARCH = re.compile(r'^/search/manga/([^/?]+)$')
+_REGEX_CHAPTER = re.compile(r'^/([^/]+)/chap-([0-9.]+)$')
+_REGEX_IMAGE = re.compile(r'^/(img|cover)/')
+_REGEX_RANGE = re.compile(r'^bytes=([0-9]+)-$')
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are sent separately,
+    # don't wait for delayed ACK of the headers
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server.mock
+        server._count()
+        if server.latency:
+            time.sleep(server.latency)
+
+        url = urllib.parse.urlsplit(self.path)
+        query = urllib.parse.parse_qs(url.query)
+        status = 200
+        headers = {}
+
+        if _REGEX_IMAGE.match(url.path):
+            content_type = 'image/jpeg'
+            body = server.image
+            headers['ETag'] = server.image_etag
+            start = 0
+            match = _REGEX_RANGE.match(self.headers.get('Range', ''))
+            # Whole image is sent if it's changed since the unfinished download
+            if self.headers.get('If-Range') not in (None, server.image_etag):
+                match = None
+            if match is not None:
+                start = int(match.group(1))
+                if start >= len(body):
+                    self._send(416, b'', 'text/plain', {'Content-Range': 'bytes */%s' % len(body)})
+                    return
+                status = 206
+                headers['Content-Range'] = 'bytes %s-%s/%s' % (start, len(body) - 1, len(body))
+            body = body[start:]
+        else:
+            content_type = 'text/html; charset=UTF-8'
+            search = _REGEX_SEARCH.match(url.path)
+            chapter = _REGEX_CHAPTER.match(url.path)
+            if search is not None:
+                page = int(query.get('page', ['1'])[0])
+                body = server._search_page(search.group(1), page)
+            elif chapter is not None:
+                body = server._chapter_page(chapter.group(1), chapter.group(2))
+            else:
+                body = server._manga_page(url.path.strip('/'))
+        self._send(status, body, content_type, headers)
+
+    def _send(self, status, body, content_type, headers):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.server.mock._write(self.wfile, body)
+
+class _ThreadingServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Client closed idle keep-alive connection
+        if isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            return
+        super().handle_error(request, client_address)
+
+class MockServer:
+    """
+    Local mangabat server in background thread
+
+    Params
+    --------
+    latency: :class:`float` (Optional, default: `0`)
+        Seconds before every response is sent
+    bandwidth: :class:`int` (Optional, default: `0`)
+        Bytes per second of every response, `0` means no limit
+    chapters: :class:`int` (Optional, default: `10`)
+        Number of chapters in every manga
+    pages: :class:`int` (Optional, default: `10`)
+        Number of pages in every chapter
+    image_size: :class:`int` (Optional, default: `102400`)
+        Size of every page image in bytes
+    search_pages: :class:`int` (Optional, default: `5`)
+        Number of search result pages
+    """
+    def __init__(
+        self,
+        latency: float=0,
+        bandwidth: int=0,
+        chapters: int=10,
+        pages: int=10,
+        image_size: int=100 * 1024,
+        search_pages: int=5
+    ):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.chapters = chapters
+        self.pages = pages
+        self.search_pages = search_pages
+        self.image = fixtures.image(image_size)
+        self.image_etag = '"%s"' % hashlib.sha1(self.image).hexdigest()
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._search_url = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return 'http://%s:%s' % (host, port)
+
+    def start(self):
+        self._server = _ThreadingServer(('127.0.0.1', 0), _Handler)
+        self._server.mock = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        # Search functions are using mangabat url
+        self._search_url = fetcher.MANGABAT_SEARCH_URL
+        fetcher.MANGABAT_SEARCH_URL = self.url + '/search/manga/'
+        return self
+
+    def stop(self):
+        fetcher.MANGABAT_SEARCH_URL = self._search_url
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def _count(self):
+        with self._lock:
+            self.requests += 1
+
+    def _write(self, wfile, body):
+        if not self.bandwidth:
+            wfile.write(body)
+            return
+        # Send 10 chunks per second
+        chunk_size = max(self.bandwidth // 10, 1)
+        for i in range(0, len(body), chunk_size):
+            chunk = body[i:i + chunk_size]
+            wfile.write(chunk)
+            time.sleep(len(chunk) / self.bandwidth)
+
+    @functools.lru_cache(maxsize=None)
+    def _manga_page(self, slug):
+        return fixtures.manga_page(self.url, slug, self.chapters).encode()
+
+    @functools.lru_cache(maxsize=None)
+    def _chapter_page(self, slug, chapter):
+        return fixtures.chapter_page(self.url, slug, chapter, self.pages).encode()
+
+    @functools.lru_cache(maxsize=None)
+    def _search_page(self, query, page):
+        return fixtures.search_page(self.url, query, page, self.search_pages).encode()
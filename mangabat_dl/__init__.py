@@ -1,6 +1,18 @@
-from typing import Any, Generator, List
-from .fetcher import _search, _fetch
+from typing import Any, AsyncGenerator, Generator, Iterable, List, Union
+from .fetcher import _search, _fetch, set_parser, get_parser
 from .classes import Manga, MangaResult
+from .downloader import MangabatDownloader
+from .retry import RetryPolicy
+from .ratelimit import RateLimiter
+from .cache import ResponseCache
+from .store import ImageStore
+from .events import Events
+from .metrics import Metrics
+from .progress import ProgressBar
+from .aio import AsyncMangabatDownloader, _async_fetch, _async_search
+from .batch import download_batch, BatchResult
+from .pipeline import map_ordered
+from .crawl import Crawler
 
 __version__ = 'v0.0.11'
 
@@ -22,50 +34,124 @@ def download_manga(mangabat_url, **params) -> Manga:
         replace file if exist
     mode: :class:`str` (Optional, default: `default`)
         Set downloader mode
-        Available options is `default`, `tachiyomi`.
+        Available options is `default`, `tachiyomi`, `cbz`.
 
         `default`:
             Download in default mode.
         `tachiyomi`:
             Download for Tachiyomi local / Offline manga
             https://tachiyomi.org/help/guides/local-manga/#folder-structure
+        `cbz`:
+            Write every chapter into `<chapter>.cbz` archive
+            instead of a folder of images
+    workers: :class:`int` (Optional, default: `1`)
+        Number of pages downloaded at the same time in each chapter
+    session: :class:`MangabatDownloader` (Optional)
+        Use given session instead of creating new one
+    prefetch_chapters: :class:`int` (Optional, default: `0`)
+        Number of chapters which the pages will be fetched ahead in background
+        while current chapter is downloading, `0` means disabled
+    chapters: :class:`str` (Optional)
+        Download only given chapters, such as `1-10,15,20-`
 
     Return
     --------
     
     :class:`Manga` object
     """
-    m = Manga(_fetch(mangabat_url))
+    m = Manga(_fetch(mangabat_url, params.get('session')))
     m.download(**params)
     return m
 
-def fetch(mangabat_url: str) -> Manga:
+def fetch(mangabat_url: str, session: MangabatDownloader=None) -> Manga:
     """
     Fetch mangabat url
 
     return :class:`Manga`
     """
-    return Manga(_fetch(mangabat_url))
+    return Manga(_fetch(mangabat_url, session))
 
-def search_all(query: str) -> List[MangaResult]:
+def fetch_many(
+    results: Iterable[Union[MangaResult, str]],
+    workers: int=4,
+    session: MangabatDownloader=None
+) -> Generator[Manga, Any, Any]:
+    """
+    Fetch many manga at the same time
+
+    Params
+    --------
+    results: :class:`Iterable[Union[MangaResult, str]]`
+        Search results or mangabat urls
+    workers: :class:`int` (Optional, default: `4`)
+        Number of manga fetched at the same time
+    session: :class:`MangabatDownloader` (Optional)
+        Use given session instead of creating new one
+
+    return :class:`Iterator[Manga]` in same order as `results`
+    """
+    if session is None:
+        with MangabatDownloader(workers) as session:
+            yield from fetch_many(results, workers, session)
+        return
+
+    def fetch_one(result):
+        url = result.url if isinstance(result, MangaResult) else result
+        return Manga(_fetch(url, session))
+
+    yield from map_ordered(results, fetch_one, workers)
+
+def search_all(
+    query: str,
+    session: MangabatDownloader=None,
+    workers: int=1,
+    max_pages: int=None,
+    max_results: int=None
+) -> List[MangaResult]:
     """
     Search all manga
 
+    Params
+    --------
+    query: :class:`str`
+        Manga to search
+    session: :class:`MangabatDownloader` (Optional)
+        Use given session instead of creating new one
+    workers: :class:`int` (Optional, default: `1`)
+        Number of result pages fetched at the same time
+    max_pages: :class:`int` (Optional)
+        Stop after given number of result pages
+    max_results: :class:`int` (Optional)
+        Stop after given number of results
+
     return :class:`List[MangaResult]`
     """
-    return [MangaResult(data) for data in _search(query)]
+    return [
+        MangaResult(data)
+        for data in _search(query, session, workers, max_pages, max_results)
+    ]
 
-def search(query: str) -> MangaResult:
+def search(query: str, session: MangabatDownloader=None) -> MangaResult:
     """
     Search 1 manga
 
     return :class:`MangaResult`
     """
-    return MangaResult(_search(query).__next__())
+    return MangaResult(_search(query, session).__next__())
 
-def search_iter(query: str) -> Generator[MangaResult, Any, Any]:
+def search_iter(
+    query: str,
+    session: MangabatDownloader=None,
+    workers: int=1,
+    max_pages: int=None,
+    max_results: int=None
+) -> Generator[MangaResult, Any, Any]:
     """
-    Search manga, but it return :class:`Iterator` object
+    Search manga, but it return :class:`Iterator` object.
+
+    Results are always yielded in page order,
+    with `workers` the next pages are fetched ahead at the same time.
+    Params are same as :func:`search_all`
 
     Usage ::
 
@@ -75,5 +161,63 @@ def search_iter(query: str) -> Generator[MangaResult, Any, Any]:
 
     yield :class:`MangaResult`
     """
-    for data in _search(query):
-        yield MangaResult(data)
\ No newline at end of file
+    for data in _search(query, session, workers, max_pages, max_results):
+        yield MangaResult(data)
+
+async def async_download_manga(mangabat_url, **params) -> Manga:
+    """
+    Download manga asynchronously by giving manga url
+
+    Params are same as :meth:`Manga.download_async`
+
+    Return
+    --------
+
+    :class:`Manga` object
+    """
+    m = Manga(await _async_fetch(mangabat_url, params.get('session')))
+    await m.download_async(**params)
+    return m
+
+async def async_fetch(mangabat_url: str, session: AsyncMangabatDownloader=None) -> Manga:
+    """
+    Fetch mangabat url asynchronously
+
+    return :class:`Manga`
+    """
+    return Manga(await _async_fetch(mangabat_url, session))
+
+async def async_search_all(query: str, session: AsyncMangabatDownloader=None) -> List[MangaResult]:
+    """
+    Search all manga asynchronously
+
+    return :class:`List[MangaResult]`
+    """
+    return [MangaResult(data) async for data in _async_search(query, session)]
+
+async def async_search(query: str, session: AsyncMangabatDownloader=None) -> MangaResult:
+    """
+    Search 1 manga asynchronously
+
+    return :class:`MangaResult`
+    """
+    gen = _async_search(query, session)
+    try:
+        return MangaResult(await gen.__anext__())
+    finally:
+        await gen.aclose()
+
+async def async_search_iter(query: str, session: AsyncMangabatDownloader=None) -> AsyncGenerator[MangaResult, Any]:
+    """
+    Search manga asynchronously, but it return :class:`AsyncIterator` object
+
+    Usage ::
+
+        from mangabat_dl import async_search_iter
+        async for result in async_search_iter('Konosuba'):
+            print(result)
+
+    yield :class:`MangaResult`
+    """
+    async for data in _async_search(query, session):
+        yield MangaResult(data)
@@ -1,26 +1,157 @@
 import argparse
 import logging
-from mangabat_dl import fetch
-from mangabat_dl.constants import DOWNLOAD_MODES
+import sys
+from mangabat_dl import (
+    fetch,
+    set_parser,
+    download_batch,
+    MangabatDownloader,
+    RetryPolicy,
+    RateLimiter,
+    ResponseCache,
+    ImageStore,
+    Metrics
+)
+from mangabat_dl.constants import DOWNLOAD_MODES, PARSERS, TRANSFER_MODES
+from mangabat_dl.utils import parse_range
+
+def read_urls(path):
+    if path == '-':
+        lines = sys.stdin.readlines()
+    else:
+        with open(path, 'r') as f:
+            lines = f.readlines()
+    urls = []
+    for line in lines:
+        line = line.strip()
+        # Skip empty lines and comments
+        if not line or line.startswith('#'):
+            continue
+        urls.append(line)
+    return urls
+
+def print_summary(results):
+    for result in results:
+        if result.error is not None:
+            print('[FAILED] %s | %s' % (result.url, result.error))
+        elif result.failed:
+            print('[FAILED] %s | %s page(s) failed to download' % (result.url, len(result.failed)))
+        else:
+            print('[OK] %s | %s' % (result.url, result.manga.title))
+    success = len([i for i in results if i.success])
+    print('%s manga downloaded, %s failed' % (success, len(results) - success))
+
+def write_metrics(metrics, path):
+    with open(path, 'w') as f:
+        f.write(metrics.export())
 
 def main():
     parser = argparse.ArgumentParser(description='Download manga from mangabat')
-    parser.add_argument('MANGABAT_URL', help='A valid mangabat url')
+    parser.add_argument('MANGABAT_URL', help='A valid mangabat url', nargs='?')
+    parser.add_argument(
+        '--input',
+        '-i',
+        help='Download all mangabat urls in given file (one url per line), use "-" to read from stdin'
+    )
+    parser.add_argument(
+        '--max-manga',
+        help='Maximum number of manga downloaded at the same time in batch mode',
+        type=int
+    )
     parser.add_argument('--quiet', '-q', help='No output', action='store_true')
     parser.add_argument('--start-chapter', help='Begin download from given chapter number', type=float)
     parser.add_argument('--end-chapter', help='Finish download from given chapter number', type=float)
+    parser.add_argument('--chapters', help='Download only given chapters, such as "1-10,15,20-"')
     parser.add_argument('--replace', '-r', help='Replace manga if exist', action='store_true')
+    parser.add_argument('--sync', '-s', help='Download only new chapters', action='store_true')
     parser.add_argument('--folder', '-f', help='Store manga in given folder')
     parser.add_argument(
         '--download-mode',
-        help='Set download mode, available options is "default" and "tachiyomi"', 
+        help='Set download mode, available options is "default", "tachiyomi" and "cbz"', 
         choices=DOWNLOAD_MODES
     )
+    parser.add_argument(
+        '--workers',
+        '-w',
+        help='Number of pages downloaded at the same time',
+        type=int,
+        default=1
+    )
+    parser.add_argument(
+        '--prefetch-chapters',
+        help='Number of chapters which the pages will be fetched ahead while downloading',
+        type=int,
+        default=0
+    )
+    parser.add_argument(
+        '--retries',
+        help='Number of retries for failed requests',
+        type=int,
+        default=3
+    )
+    parser.add_argument(
+        '--rate-limit',
+        help='Maximum requests per second for each host',
+        type=float
+    )
+    parser.add_argument(
+        '--cache-dir',
+        help='Cache manga, chapter and search pages in given folder'
+    )
+    parser.add_argument(
+        '--cache-ttl',
+        help='Seconds before cached pages need to be checked to the server',
+        type=float,
+        default=3600
+    )
+    parser.add_argument(
+        '--store-dir',
+        help='Store same images once in given folder and hardlink them into chapters folder'
+    )
+    parser.add_argument(
+        '--transfer-mode',
+        help='Set how pages are written, "tuned" (default) or "legacy"',
+        choices=TRANSFER_MODES,
+        default='tuned'
+    )
+    parser.add_argument(
+        '--metrics',
+        help='Write download metrics in Prometheus text format to given file after finished'
+    )
+    parser.add_argument(
+        '--parser',
+        help='Set HTML parser, default to "lxml" if it\'s installed, otherwise "bs4"',
+        choices=PARSERS
+    )
 
     downloader_log = logging.getLogger('mangabat_dl.downloader')
 
     args = parser.parse_args()
 
+    if args.MANGABAT_URL is None and args.input is None:
+        parser.error('MANGABAT_URL or --input is required')
+
+    if args.chapters is not None:
+        try:
+            parse_range(args.chapters)
+        except ValueError as e:
+            parser.error('--chapters: %s' % e)
+
+    # Batch mode and sync download every manga or every new chapter,
+    # don't ignore the chapters selection silently
+    selection = [
+        name for name, value in (
+            ('--start-chapter', args.start_chapter),
+            ('--end-chapter', args.end_chapter),
+            ('--chapters', args.chapters)
+        ) if value is not None
+    ]
+    if selection:
+        if args.input is not None:
+            parser.error('%s cannot be used with --input' % ', '.join(selection))
+        if args.sync:
+            parser.error('%s cannot be used with --sync' % ', '.join(selection))
+
     if not args.quiet:
         handler = logging.StreamHandler()
         formatter = logging.Formatter('[%(levelname)s] %(type)s | %(message)s')
@@ -28,15 +159,81 @@ def main():
         downloader_log.addHandler(handler)
         downloader_log.setLevel(logging.INFO)
 
-    manga = fetch(args.MANGABAT_URL)
-    manga.download(
-        args.start_chapter,
-        args.end_chapter,
-        args.folder,
-        not args.quiet,
-        args.replace,
-        "default" if args.download_mode is None else args.download_mode
+    if args.parser is not None:
+        set_parser(args.parser)
+
+    session = MangabatDownloader(
+        args.workers,
+        retry_policy=RetryPolicy(args.retries),
+        rate_limiter=None if args.rate_limit is None else RateLimiter(args.rate_limit),
+        cache=None if args.cache_dir is None else ResponseCache(args.cache_dir, args.cache_ttl),
+        store=None if args.store_dir is None else ImageStore(args.store_dir),
+        transfer_mode=args.transfer_mode
     )
+    metrics = None if args.metrics is None else Metrics(session.events)
+
+    results = None
+    failed = None
+    try:
+        # Batch mode
+        if args.input is not None:
+            urls = read_urls(args.input)
+            if args.MANGABAT_URL is not None:
+                urls.insert(0, args.MANGABAT_URL)
+            results = download_batch(
+                urls,
+                args.folder,
+                False,
+                args.replace,
+                "default" if args.download_mode is None else args.download_mode,
+                args.workers,
+                session,
+                args.sync,
+                args.prefetch_chapters,
+                args.max_manga
+            )
+        else:
+            manga = fetch(args.MANGABAT_URL, session)
+            if args.sync:
+                failed = manga.sync(
+                    args.folder,
+                    not args.quiet,
+                    "default" if args.download_mode is None else args.download_mode,
+                    args.workers,
+                    session,
+                    args.prefetch_chapters
+                )
+            else:
+                failed = manga.download(
+                    args.start_chapter,
+                    args.end_chapter,
+                    args.folder,
+                    not args.quiet,
+                    args.replace,
+                    "default" if args.download_mode is None else args.download_mode,
+                    args.workers,
+                    session,
+                    prefetch_chapters=args.prefetch_chapters,
+                    chapters=args.chapters
+                )
+    finally:
+        # Metrics of failed download are written too
+        session.close()
+        if metrics is not None:
+            write_metrics(metrics, args.metrics)
+
+    if results is not None:
+        if not args.quiet:
+            print_summary(results)
+        if not all(i.success for i in results):
+            sys.exit(1)
+
+    if failed:
+        if not args.quiet:
+            for page in failed:
+                print('[FAILED] %s | Chapter %s page %s' % (args.MANGABAT_URL, page.chapter, page.page))
+            print('%s page(s) failed to download' % len(failed))
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
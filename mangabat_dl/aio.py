@@ -0,0 +1,213 @@
+import asyncio
+import os
+import logging
+from pathlib import Path
+from .fetcher import (
+    _parse_manga,
+    _parse_chapter_images,
+    _parse_search_first_page,
+    _search_parse_manga,
+    _search_url
+)
+from .downloader import MangabatDownloader, _REGEX_PAGE_NUMBER, _resolve_chapter_path, _get_part_path
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+log = logging.getLogger('mangabat_dl.downloader')
+
+class AsyncMangabatDownloader:
+    """
+    Asynchronous version of :class:`MangabatDownloader`, built on top of aiohttp
+
+    Params
+    --------
+    concurrency: :class:`int` (Optional, default: `10`)
+        Maximum number of requests running at the same time
+    limit_per_host: :class:`int` (Optional, default: `0`)
+        Maximum number of connections to the same host, `0` means no limit
+    session: :class:`aiohttp.ClientSession` (Optional)
+        Use given aiohttp session instead of creating new one
+    """
+    _headers = MangabatDownloader._headers
+
+    def __init__(self, concurrency: int=10, limit_per_host: int=0, session=None):
+        if aiohttp is None:
+            raise ImportError(
+                'aiohttp is required for async download, '
+                'install it with "pip install mangabat-dl[async]"'
+            )
+        self.concurrency = concurrency
+        self.limit_per_host = limit_per_host
+        self._session = session
+        self._own_session = session is None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    def _get_session(self):
+        # aiohttp session and semaphore must be created inside running event loop
+        if self._session is None:
+            connector = aiohttp.TCPConnector(
+                limit=self.concurrency,
+                limit_per_host=self.limit_per_host
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    async def close(self):
+        if self._session is not None and self._own_session:
+            await self._session.close()
+            self._session = None
+
+    async def get_text(self, url: str, **requests_params) -> str:
+        session = self._get_session()
+        async with self._semaphore:
+            async with session.get(url, **requests_params) as r:
+                r.raise_for_status()
+                return await r.text()
+
+    async def get_bytes(self, url: str, **requests_params) -> bytes:
+        session = self._get_session()
+        async with self._semaphore:
+            async with session.get(url, **requests_params) as r:
+                r.raise_for_status()
+                return await r.read()
+
+    async def save(self, url: str, file_path, **requests_params) -> int:
+        """
+        Download given url into `file_path` without keeping it in memory.
+        The file is written to `<file_path>.part` and renamed after it's complete
+
+        return :class:`int` size of the file
+        """
+        part_path = _get_part_path(file_path)
+        file_size = 0
+        session = self._get_session()
+        async with self._semaphore:
+            async with session.get(url, headers=self._headers, **requests_params) as r:
+                r.raise_for_status()
+                try:
+                    with open(part_path, 'wb') as local_file:
+                        async for chunk in r.content.iter_chunked(65536):
+                            local_file.write(chunk)
+                            file_size += len(chunk)
+                except BaseException:
+                    if os.path.exists(part_path):
+                        os.remove(part_path)
+                    raise
+        os.replace(part_path, file_path)
+        return file_size
+
+    async def download(
+        self,
+        url: str,
+        manga,
+        name_chapter: str,
+        chapter: float,
+        name_file: str,
+        folder: str=None,
+        replace: bool=False,
+        chapter_path: Path=None,
+        **requests_params
+    ):
+        name_manga = manga.title
+        page = _REGEX_PAGE_NUMBER.search(name_file).group()
+        if chapter_path is None:
+            chapter_path = _resolve_chapter_path(folder, name_manga, name_chapter)
+        file_path = chapter_path / name_file
+
+        session = self._get_session()
+        async with self._semaphore:
+            async with session.get(url, headers=self._headers, **requests_params) as r:
+                r.raise_for_status()
+
+                # Check if this file exist and have same file size
+                if os.path.exists(file_path) and r.content_length is not None:
+                    if r.content_length == os.stat(file_path).st_size:
+                        if not replace:
+                            log.info('%s Chapter %s Page %s exist and have same size as the server has, skipping...' % (
+                                name_manga,
+                                chapter,
+                                page
+                            ), extra={"type": 'DOWNLOADER'})
+                            return
+                    else:
+                        log.warning('File is exist but %s Chapter %s Page %s size doesn\'t match as the server has, re-downloading...' % (
+                            name_manga,
+                            chapter,
+                            page
+                        ), extra={"type": 'DOWNLOADER'})
+
+                log.info('Starting download %s Chapter %s page %s' % (
+                    name_manga,
+                    chapter,
+                    page
+                ), extra={"type": 'DOWNLOADER'})
+
+                part_path = _get_part_path(file_path)
+                try:
+                    with open(part_path, "wb") as local_file:
+                        async for chunk in r.content.iter_chunked(8192):
+                            local_file.write(chunk)
+                except BaseException:
+                    # Cancelled or failed in the middle of download,
+                    # don't leave half-written file behind
+                    if os.path.exists(part_path):
+                        os.remove(part_path)
+                    raise
+                os.replace(part_path, file_path)
+
+        log.info('Finished download %s Chapter %s page %s' % (
+            name_manga,
+            chapter,
+            page
+        ), extra={"type": 'DOWNLOADER'})
+
+async def _run_parser(func, *args):
+    # Parsing is CPU bound, don't block the event loop
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(None, func, *args)
+
+async def _async_fetch_chapter_images(chapter_url, session=None):
+    if session is None:
+        async with AsyncMangabatDownloader() as session:
+            return await _async_fetch_chapter_images(chapter_url, session)
+    body = await session.get_text(chapter_url)
+    return await _run_parser(_parse_chapter_images, body)
+
+async def _async_fetch(mangabat_url, session=None):
+    if session is None:
+        async with AsyncMangabatDownloader() as session:
+            return await _async_fetch(mangabat_url, session)
+    body = await session.get_text(mangabat_url)
+    return await _run_parser(_parse_manga, body)
+
+async def _async_search(query, session=None):
+    # Reuse one session for all result pages
+    if session is None:
+        async with AsyncMangabatDownloader() as session:
+            async for data in _async_search(query, session):
+                yield data
+        return
+
+    body = await session.get_text(_search_url(query))
+    results, pages = await _run_parser(_parse_search_first_page, body, query)
+    for data in results:
+        yield data
+
+    # Do parsing in next pages
+    for page in pages:
+        body = await session.get_text(page)
+        n_results = []
+        await _run_parser(_search_parse_manga, body, n_results)
+        for data in n_results:
+            yield data
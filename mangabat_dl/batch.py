@@ -0,0 +1,152 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List
+from .classes import Manga, ChapterPage
+from .downloader import MangabatDownloader
+from .fetcher import _fetch
+
+dl_log = logging.getLogger('mangabat_dl.downloader')
+
+class BatchResult:
+    """
+    Result of a manga downloaded by :func:`download_batch`
+    """
+    def __init__(self, url: str, manga: Manga=None, failed: List[ChapterPage]=None, error: Exception=None):
+        self.url = url
+        self.manga = manga
+        self.failed = failed or []
+        self.error = error
+
+    def __repr__(self) -> str:
+        return '<BatchResult url="%s" success=%s>' % (
+            self.url,
+            self.success
+        )
+
+    @property
+    def success(self) -> bool:
+        """
+        Is this manga downloaded without any error ?
+
+        return :class:`bool`
+        """
+        return self.error is None and not self.failed
+
+def download_batch(
+    urls: Iterable[str],
+    folder: str=None,
+    progress_bar: bool=False,
+    replace: bool=False,
+    mode: str="default",
+    workers: int=4,
+    session: MangabatDownloader=None,
+    sync: bool=False,
+    prefetch_chapters: int=0,
+    max_manga: int=None,
+    **requests_params
+) -> List[BatchResult]:
+    """
+    Download many manga at the same time with one worker pool and one session.
+
+    All pages are downloaded in one pool of `workers` threads,
+    every manga queue one chapter at a time into it,
+    so the pool is shared fairly between manga chapter by chapter.
+
+    Params
+    --------
+    urls: :class:`Iterable[str]`
+        Mangabat urls
+    folder: :class:`str` (Optional)
+        Choose folder where you want to store the manga
+    progress_bar: :class:`bool` (Optional, default: `False`)
+        Set progress bar for downloading
+    replace: :class:`bool` (Optional, default: `False`)
+        replace file if exist, ignored if `sync` is `True`
+    mode: :class:`str` (Optional, default: `default`)
+        Set downloader mode, see :meth:`Manga.download`
+    workers: :class:`int` (Optional, default: `4`)
+        Maximum number of pages downloaded at the same time for all manga
+    session: :class:`MangabatDownloader` (Optional)
+        Use given session instead of creating new one
+    sync: :class:`bool` (Optional, default: `False`)
+        Download only new chapters, see :meth:`Manga.sync`
+    prefetch_chapters: :class:`int` (Optional, default: `0`)
+        Number of chapters which the pages will be fetched ahead in background
+    max_manga: :class:`int` (Optional)
+        Maximum number of manga downloaded at the same time, default to `workers`
+
+    Return
+    --------
+
+    :class:`List[BatchResult]` in same order as `urls`
+    """
+    urls = list(urls)
+    if not urls:
+        return []
+
+    if session is None:
+        with MangabatDownloader(workers) as session:
+            return download_batch(
+                urls,
+                folder,
+                progress_bar,
+                replace,
+                mode,
+                workers,
+                session,
+                sync,
+                prefetch_chapters,
+                max_manga,
+                **requests_params
+            )
+
+    def download_manga(url, pages_executor):
+        try:
+            manga = Manga(_fetch(url, session))
+        except Exception as e:
+            dl_log.error('Failed to fetch "%s", reason: %s' % (
+                url,
+                e
+            ), extra={"type": 'DOWNLOADER'})
+            return BatchResult(url, error=e)
+
+        try:
+            if sync:
+                failed = manga.sync(
+                    folder,
+                    progress_bar,
+                    mode,
+                    workers,
+                    session,
+                    prefetch_chapters,
+                    pages_executor,
+                    **requests_params
+                )
+            else:
+                failed = manga.download(
+                    folder=folder,
+                    progress_bar=progress_bar,
+                    replace=replace,
+                    mode=mode,
+                    workers=workers,
+                    session=session,
+                    prefetch_chapters=prefetch_chapters,
+                    executor=pages_executor,
+                    **requests_params
+                )
+        except Exception as e:
+            dl_log.error('Failed to download "%s", reason: %s' % (
+                manga.title,
+                e
+            ), extra={"type": 'DOWNLOADER'})
+            return BatchResult(url, manga, error=e)
+        return BatchResult(url, manga, failed)
+
+    max_manga = min(max_manga or workers, len(urls))
+    with ThreadPoolExecutor(max_workers=workers) as pages_executor:
+        with ThreadPoolExecutor(max_workers=max_manga) as manga_executor:
+            futures = [
+                manga_executor.submit(download_manga, url, pages_executor)
+                for url in urls
+            ]
+            return [future.result() for future in futures]
@@ -0,0 +1,130 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+
+class CacheEntry:
+    def __init__(self, data: dict):
+        self._data = data
+
+    @property
+    def url(self) -> str:
+        return self._data['url']
+
+    @property
+    def body(self) -> str:
+        return self._data['body']
+
+    @property
+    def etag(self) -> str:
+        return self._data['etag']
+
+    @property
+    def last_modified(self) -> str:
+        return self._data['last_modified']
+
+    @property
+    def stored(self) -> float:
+        return self._data['stored']
+
+class ResponseCache:
+    """
+    On-disk cache for HTML pages, can be shared between processes.
+
+    Fresh responses (younger than `ttl`) are returned without any request,
+    stale responses are revalidated with `ETag` / `Last-Modified`.
+    When the cache is bigger than `max_size`, least recently used responses are removed.
+
+    Params
+    --------
+    path: :class:`str`
+        Folder where the responses is stored
+    ttl: :class:`float` (Optional, default: `3600`)
+        Seconds before a response need to be revalidated
+    max_size: :class:`int` (Optional, default: `104857600`)
+        Maximum total size of the cache in bytes
+    """
+    def __init__(self, path: str, ttl: float=3600, max_size: int=100 * 1024 * 1024):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+
+    def _get_path(self, url: str) -> Path:
+        return self.path / (hashlib.sha1(url.encode()).hexdigest() + '.json')
+
+    def get(self, url: str) -> CacheEntry:
+        """Get cached response of given url, return `None` if it's not cached"""
+        path = self._get_path(url)
+        try:
+            data = json.loads(path.read_text())
+            # Mark as recently used
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            return None
+        return CacheEntry(data)
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.stored < self.ttl
+
+    def set(self, url: str, body: str, etag: str=None, last_modified: str=None):
+        """Store response of given url"""
+        self._write(url, {
+            "url": url,
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored": time.time()
+        })
+        self._evict()
+
+    def touch(self, entry: CacheEntry):
+        """Mark given response as fresh again, after it's revalidated"""
+        data = entry._data.copy()
+        data['stored'] = time.time()
+        self._write(entry.url, data)
+
+    def _write(self, url: str, data: dict):
+        path = self._get_path(url)
+        # Write to temporary file and then rename it,
+        # so other processes never read half-written response
+        tmp_path = path.with_name('%s.%s.%s.tmp' % (path.name, os.getpid(), threading.get_ident()))
+        tmp_path.write_text(json.dumps(data))
+        os.replace(tmp_path, path)
+
+    def _evict(self):
+        with self._lock:
+            files = []
+            total = 0
+            for path in self.path.glob('*.json'):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+            if total <= self.max_size:
+                return
+
+            # Remove least recently used first
+            files.sort()
+            for _, size, path in files:
+                if total <= self.max_size:
+                    break
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+    def clear(self):
+        """Remove all cached responses"""
+        for path in self.path.glob('*.json'):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,126 @@
+import os
+import threading
+import zipfile
+from pathlib import Path
+
+def _get_entry_name(page: int, filename: str) -> str:
+    # Zero padded, so readers sorting by name get pages in right order
+    return '%03d%s' % (page, os.path.splitext(filename)[1])
+
+class CBZWriter:
+    """
+    Write chapter pages into a CBZ (zip) archive in page order.
+
+    Pages can be given from many threads in any order, each page is written
+    as soon as all pages before it are written or skipped.
+    The archive is written to `<path>.part` and renamed to `path` after it's closed.
+
+    Pages from existing archive can be copied to the new one
+    without downloading it again, unless `replace` is `True`.
+    Pages of existing archive that are not written (not selected or failed to download)
+    are kept in the new archive too, after the written pages.
+    If the archive is closed because of an error, the existing archive is kept as it is.
+
+    Params
+    --------
+    path: :class:`pathlib.Path`
+        Archive path
+    replace: :class:`bool` (Optional, default: `False`)
+        Don't use pages from existing archive instead of downloading them
+    """
+    def __init__(self, path: Path, replace: bool=False):
+        self.path = Path(path)
+        self.part_path = self.path.with_name(self.path.name + '.part')
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.replace = replace
+
+        self._old = None
+        if self.path.exists():
+            try:
+                self._old = zipfile.ZipFile(self.path)
+            except zipfile.BadZipFile:
+                self._old = None
+
+        # Images are already compressed
+        self._zip = zipfile.ZipFile(self.part_path, 'w', zipfile.ZIP_STORED)
+        self._lock = threading.Lock()
+        self._next = 0
+        self._pending = {}
+        self._names = set()
+        self.written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+    def has(self, name: str) -> bool:
+        """Check if given page is in the existing archive and it can be used"""
+        if self._old is None or self.replace:
+            return False
+        try:
+            self._old.getinfo(name)
+        except KeyError:
+            return False
+        return True
+
+    def copy(self, index: int, name: str) -> int:
+        """Copy given page from the existing archive, return size of the page"""
+        with self._lock:
+            data = self._old.read(name)
+        self.write(index, name, data)
+        return len(data)
+
+    def write(self, index: int, name: str, data: bytes):
+        """Write page in position `index` of the chapter"""
+        with self._lock:
+            self._pending[index] = (name, data)
+            self._flush()
+
+    def skip(self, index: int):
+        """Don't wait for page in position `index`, e.g. it's failed to download"""
+        with self._lock:
+            self._pending[index] = None
+            self._flush()
+
+    def _flush(self):
+        while self._next in self._pending:
+            page = self._pending.pop(self._next)
+            if page is not None:
+                self._zip.writestr(page[0], page[1])
+                self._names.add(page[0])
+                self.written += 1
+            self._next += 1
+
+    def close(self):
+        """Finish the archive and replace the existing one with it"""
+        with self._lock:
+            # Write what's left, pages after a missing one are still saved
+            for index in sorted(self._pending):
+                self._next = index
+                self._flush()
+            kept = 0
+            if self._old is not None:
+                for info in self._old.infolist():
+                    if info.filename not in self._names:
+                        self._zip.writestr(info, self._old.read(info))
+                        kept += 1
+                self._old.close()
+            self._zip.close()
+        # Don't leave empty archive behind
+        if not self.written and not kept:
+            os.remove(self.part_path)
+            return
+        os.replace(self.part_path, self.path)
+
+    def abort(self):
+        """Discard the new archive, the existing one is not changed"""
+        with self._lock:
+            self._zip.close()
+            if self._old is not None:
+                self._old.close()
+        os.remove(self.part_path)
@@ -1,22 +1,36 @@
+import asyncio
 import json
 import re
 import logging
-import requests
 import os
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import Any, Dict, Generator, Iterable, List
 from pathlib import Path
 from .constants import DOWNLOAD_MODES
-from .fetcher import _fetch, _fetch_chapter_images
+from .fetcher import _fetch, _fetch_chapter_images, _iter_chapter_images
 from .downloader import MangabatDownloader
-from .utils import filter_forbidden_names
+from .pipeline import prefetch
+from .manifest import Manifest
+from .cbz import CBZWriter, _get_entry_name
+from .progress import ProgressBar
+from .utils import filter_forbidden_names, parse_range, select_range
 
 dl_log = logging.getLogger('mangabat_dl.downloader')
 dl_log.setLevel(logging.CRITICAL)
 
+_REGEX_PAGE_FILENAME = re.compile('[0-9]{1,}.jpg')
+_REGEX_PAGE_NUMBER = re.compile(r'[0-9]{1,}')
+
 class ChapterPage:
-    def __init__(self, data) -> None:
-        self._data = data
+    # Long series have thousands of pages, keep every page small
+    # by sharing the chapter informations instead of copying them
+    __slots__ = ('_chapter', '_image')
+
+    def __init__(self, chapter: 'Chapter', image: str) -> None:
+        self._chapter = chapter
+        self._image = image
 
     @property
     def manga(self):
@@ -25,7 +39,7 @@ class ChapterPage:
 
         return :class:`Manga`
         """
-        return self._data['manga']
+        return self._chapter.manga
 
     @property
     def name(self) -> str:
@@ -34,7 +48,7 @@ class ChapterPage:
 
         return :class:`str`
         """
-        return self._data['name']
+        return self._chapter.name
 
     @property
     def chapter(self) -> float:
@@ -43,7 +57,7 @@ class ChapterPage:
 
         return :class:`float`
         """
-        return self._data['chapter']
+        return self._chapter.chapter
 
     @property
     def chapter_url(self) -> str:
@@ -52,7 +66,7 @@ class ChapterPage:
 
         return :class:`float`
         """
-        return self._data['url']
+        return self._chapter.url
 
     @property
     def page(self) -> int:
@@ -62,7 +76,7 @@ class ChapterPage:
         return :class:`int`
         """
         file = self.page_filename
-        num = int(re.compile(r'[0-9]{1,}').search(file).group())
+        num = int(_REGEX_PAGE_NUMBER.search(file).group())
         return num
 
     @property
@@ -72,8 +86,7 @@ class ChapterPage:
 
         return :class:`str`
         """
-        r = re.compile('[0-9]{1,}.jpg')
-        file = r.search(self.url).group()
+        file = _REGEX_PAGE_FILENAME.search(self.url).group()
         return file
 
     @property
@@ -83,19 +96,38 @@ class ChapterPage:
 
         return :class:`str`
         """
-        return self._data['image']
+        return self._image
 
     def download(
         self,
         folder: str=None,
         progress_bar: bool=True,
         replace: bool=False,
+        session: MangabatDownloader=None,
+        manifest: Manifest=None,
         **requests_params
     ):
         """
         Download this chapter page
-        """
-        downloader = MangabatDownloader()
+
+        Params
+        --------
+        folder: :class:`str` (Optional)
+            Choose folder where you want to store this page
+        progress_bar: :class:`bool` (Optional, default: `True`)
+            Set progress bar for downloading
+        replace: :class:`bool` (Optional, default: `False`)
+            replace file if exist
+        session: :class:`MangabatDownloader` (Optional)
+            Use given session instead of creating new one
+        manifest: :class:`Manifest` (Optional)
+            Skip this page without any request if it's recorded as complete
+            and record it after finished
+        """
+        if session is None:
+            downloader = MangabatDownloader()
+        else:
+            downloader = session
         downloader.download(
             self.url,
             self.manga,
@@ -105,13 +137,121 @@ class ChapterPage:
             folder,
             progress_bar,
             replace,
+            manifest,
+            **requests_params
+        )
+        if session is None:
+            downloader.close()
+
+    def _download_to_path(
+        self,
+        chapter_path: Path,
+        progress_bar: bool=True,
+        replace: bool=False,
+        session: MangabatDownloader=None,
+        manifest: Manifest=None,
+        **requests_params
+    ):
+        # `chapter_path` is already created by Chapter.download()
+        session.download(
+            self.url,
+            self.manga,
+            self.name,
+            self.chapter,
+            self.page_filename,
+            progress_bar=progress_bar,
+            replace=replace,
+            manifest=manifest,
+            chapter_path=chapter_path,
+            **requests_params
+        )
+
+    def _download_to_archive(
+        self,
+        archive: CBZWriter,
+        index: int,
+        progress_bar: bool=True,
+        replace: bool=False,
+        session: MangabatDownloader=None,
+        **requests_params
+    ):
+        name = _get_entry_name(self.page, self.page_filename)
+
+        # Pages in existing archive are only written after it's complete,
+        # so it can be used without asking the server
+        if not replace and archive.has(name):
+            dl_log.info('%s Chapter %s Page %s is already in the archive, skipping...' % (
+                self.manga.title,
+                self.chapter,
+                self.page
+            ), extra={"type": 'DOWNLOADER'})
+            size = archive.copy(index, name)
+            session.events.emit(
+                'page_done',
+                url=self.url,
+                manga=self.manga,
+                chapter=self.chapter,
+                page=self.page,
+                size=size,
+                skipped=True,
+                duration=0
+            )
+            return
+
+        data = session.download_bytes(
+            self.url,
+            self.manga,
+            self.chapter,
+            self.page_filename,
+            progress_bar,
+            **requests_params
+        )
+        archive.write(index, name, data)
+
+    async def download_async(
+        self,
+        folder: str=None,
+        replace: bool=False,
+        session=None,
+        **requests_params
+    ):
+        """
+        Download this chapter page asynchronously
+
+        Params
+        --------
+        folder: :class:`str` (Optional)
+            Choose folder where you want to store this page
+        replace: :class:`bool` (Optional, default: `False`)
+            replace file if exist
+        session: :class:`AsyncMangabatDownloader` (Optional)
+            Use given session instead of creating new one
+        """
+        from .aio import AsyncMangabatDownloader
+
+        if session is None:
+            async with AsyncMangabatDownloader() as session:
+                return await self.download_async(folder, replace, session, **requests_params)
+
+        await session.download(
+            self.url,
+            self.manga,
+            self.name,
+            self.chapter,
+            self.page_filename,
+            folder,
+            replace,
             **requests_params
         )
-        downloader.close()
 
 class Chapter:
-    def __init__(self, data) -> None:
-        self._data = data
+    __slots__ = ('_manga', '_name', '_chapter', '_url', '_cached_pages')
+
+    def __init__(self, manga, name: str, chapter: float, url: str) -> None:
+        self._manga = manga
+        self._name = name
+        self._chapter = chapter
+        self._url = url
         self._cached_pages = None
 
     @property
@@ -121,7 +261,7 @@ class Chapter:
 
         return :class:`Manga`
         """
-        return self._data['manga']
+        return self._manga
 
     @property
     def name(self) -> str:
@@ -130,7 +270,7 @@ class Chapter:
 
         return :class:`str`
         """
-        return self._data['name']
+        return self._name
 
     @property
     def chapter(self) -> float:
@@ -139,7 +279,7 @@ class Chapter:
 
         return :class:`float`
         """
-        return self._data['chapter']
+        return self._chapter
 
     @property
     def url(self) -> str:
@@ -148,26 +288,129 @@ class Chapter:
 
         return :class:`float`
         """
-        return self._data['url']
+        return self._url
 
-    def get_all_chapter_pages(self) -> List[ChapterPage]:
+    def get_all_chapter_pages(self, session: MangabatDownloader=None) -> List[ChapterPage]:
         """
         Get chapter pages
 
         return :class:`List[ChapterPage]`
         """
         if self._cached_pages is None:
-            self._cached_pages = [
-                ChapterPage({
-                    "name": self.name,
-                    "chapter": self.chapter,
-                    "url": self.url,
-                    "manga": self.manga,
-                    "image": i
-                }) for i in _fetch_chapter_images(self.url)
-            ]
+            self._cached_pages = self._create_pages(_fetch_chapter_images(self.url, session))
         return self._cached_pages
 
+    def iter_chapter_pages(self, session: MangabatDownloader=None) -> Generator[ChapterPage, Any, Any]:
+        """
+        Get chapter pages, but it return :class:`Iterator` object.
+
+        Pages are yielded while the chapter page is still downloading
+
+        yield :class:`ChapterPage`
+        """
+        if self._cached_pages is not None:
+            yield from self._cached_pages
+            return
+
+        pages = []
+        for image in _iter_chapter_images(self.url, session):
+            page = self._create_pages([image])[0]
+            pages.append(page)
+            yield page
+        self._cached_pages = pages
+
+    async def get_all_chapter_pages_async(self, session=None) -> List[ChapterPage]:
+        """
+        Get chapter pages asynchronously
+
+        return :class:`List[ChapterPage]`
+        """
+        from .aio import _async_fetch_chapter_images
+
+        if self._cached_pages is None:
+            images = await _async_fetch_chapter_images(self.url, session)
+            self._cached_pages = self._create_pages(images)
+        return self._cached_pages
+
+    def _create_pages(self, images: List[str]) -> List[ChapterPage]:
+        return [ChapterPage(self, i) for i in images]
+
+    def _download_pages(
+        self,
+        pages: Iterable[ChapterPage],
+        chapter_path: Path=None,
+        progress_bar: bool=True,
+        replace: bool=False,
+        workers: int=1,
+        session: MangabatDownloader=None,
+        manifest: Manifest=None,
+        executor: Executor=None,
+        archive: CBZWriter=None,
+        **requests_params
+    ) -> List[ChapterPage]:
+        failed = []
+
+        def download_page(index, page):
+            try:
+                if archive is not None:
+                    page._download_to_archive(archive, index, progress_bar, replace, session, **requests_params)
+                else:
+                    page._download_to_path(chapter_path, progress_bar, replace, session, manifest, **requests_params)
+            except Exception as e:
+                if archive is not None:
+                    archive.skip(index)
+                session.events.emit(
+                    'error',
+                    url=page.url,
+                    manga=self.manga,
+                    chapter=self.chapter,
+                    page=page.page,
+                    error=e
+                )
+                dl_log.error('Failed to download %s Chapter %s page %s, reason: %s' % (
+                    self.manga.title,
+                    self.chapter,
+                    page.page,
+                    e
+                ), extra={"type": 'DOWNLOADER'})
+                return False
+            return True
+
+        def submit_pages(executor):
+            # Every page is submitted as soon as it's available,
+            # files name are taken from the page url
+            # and archive is written in page order,
+            # so it doesn't matter which page is finished first
+            futures = []
+            try:
+                for index, page in enumerate(pages):
+                    futures.append((page, executor.submit(download_page, index, page)))
+            except BaseException:
+                # Chapter page failed while it's still loading,
+                # pages that are already started must be finished
+                # before the archive (or anything else) is closed
+                for page, future in futures:
+                    future.cancel()
+                wait([future for page, future in futures])
+                raise
+            for page, future in futures:
+                if not future.result():
+                    failed.append(page)
+            return failed
+
+        # Pages are queued to shared pool with other chapters
+        if executor is not None:
+            return submit_pages(executor)
+
+        if workers is None or workers <= 1:
+            for index, page in enumerate(pages):
+                if not download_page(index, page):
+                    failed.append(page)
+            return failed
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return submit_pages(executor)
+
     def download(
         self,
         start_page: int=None,
@@ -175,8 +418,14 @@ class Chapter:
         folder: str=None,
         progress_bar: bool=True,
         replace: bool=False,
+        workers: int=1,
+        session: MangabatDownloader=None,
+        manifest: Manifest=None,
+        executor: Executor=None,
+        mode: str="default",
+        pages: str=None,
         **requests_params
-    ):
+    ) -> List[ChapterPage]:
         """
         Download this chapter
 
@@ -192,50 +441,387 @@ class Chapter:
             Set progress bar for downloading
         replace: :class:`bool` (Optional, default: `False`)
             replace file if exist
+        workers: :class:`int` (Optional, default: `1`)
+            Number of pages downloaded at the same time
+        session: :class:`MangabatDownloader` (Optional)
+            Use given session instead of creating new one
+        manifest: :class:`Manifest` (Optional)
+            Use given manifest instead of loading it from manga folder
+        executor: :class:`concurrent.futures.Executor` (Optional)
+            Download pages in given executor instead of creating new one,
+            `workers` is ignored if this is given
+        mode: :class:`str` (Optional, default: `default`)
+            Set to `cbz` to write this chapter into `<chapter>.cbz` archive
+            instead of a folder, see :meth:`Manga.download`
+        pages: :class:`str` (Optional)
+            Download only given pages, such as `1-10,15,20-`.
+            Combined with `start_page` and `end_page` if they're given too
+
+        Return
+        --------
+
+        :class:`List[ChapterPage]` pages that failed to download
         """
         if start_page is not None and end_page is not None:
             if start_page >= end_page:
                 raise ValueError('start_page cannot be same or more than end_page')
+        if pages is not None:
+            # Invalid range is raised before anything is downloaded
+            parse_range(pages)
+
+        if session is None:
+            with MangabatDownloader(workers) as session:
+                return self.download(
+                    start_page,
+                    end_page,
+                    folder,
+                    progress_bar,
+                    replace,
+                    workers,
+                    session,
+                    manifest,
+                    executor,
+                    mode,
+                    pages,
+                    **requests_params
+                )
 
-        # Start downloading all of them
-        if start_page is None and end_page is None:
-            for page in self.get_all_chapter_pages():
-                page.download(folder, progress_bar, replace, **requests_params)
-            return
+        if manifest is None:
+            manifest = Manifest(self.manga._get_manga_path(folder))
+            try:
+                return self.download(
+                    start_page,
+                    end_page,
+                    folder,
+                    progress_bar,
+                    replace,
+                    workers,
+                    session,
+                    manifest,
+                    executor,
+                    mode,
+                    pages,
+                    **requests_params
+                )
+            finally:
+                manifest.save()
+
+        # One progress bar for all pages, instead of one for every page
+        if progress_bar:
+            with ProgressBar(session.events, self.manga, self.chapter):
+                return self.download(
+                    start_page,
+                    end_page,
+                    folder,
+                    False,
+                    replace,
+                    workers,
+                    session,
+                    manifest,
+                    executor,
+                    mode,
+                    pages,
+                    **requests_params
+                )
 
-        for page in self.get_all_chapter_pages():
-            if page.page >= start_page:
-                if end_page is not None:
-                    if page.page <= end_page:
-                        page.download(folder, progress_bar, replace, **requests_params)
-                    else:
-                        dl_log.warn('Ignoring page %s as param "end_page" is %s' % (
-                            page.page,
-                            end_page
-                        ), extra={"type": 'DOWNLOADER'})
-                        continue
-                else:
-                    page.download(folder, progress_bar, replace, **requests_params)
-            else:
-                dl_log.warn('Ignoring page %s as param "start_page" is %s' % (
+        if mode == 'cbz':
+            chapter_path = self._get_archive_path(folder)
+            # Archive is written in one piece, so it can be skipped
+            # only if it's completely downloaded before
+            if not replace and manifest.is_chapter_complete(chapter_path) and chapter_path.exists():
+                dl_log.info('%s Chapter %s is already downloaded, skipping...' % (
+                    self.manga.title,
+                    self.chapter
+                ), extra={"type": 'DOWNLOADER'})
+                return []
+        else:
+            # Resolved and created once, instead of for every page
+            chapter_path = self._get_chapter_path(folder)
+            chapter_path.mkdir(parents=True, exist_ok=True)
+
+        select_all = start_page is None and end_page is None and pages is None
+        if select_all:
+            # Start downloading while the chapter page is still loading
+            selected = self.iter_chapter_pages(session)
+        else:
+            selected = self._select_pages(
+                self.get_all_chapter_pages(session),
+                start_page,
+                end_page,
+                pages
+            )
+
+        if mode == 'cbz':
+            with CBZWriter(chapter_path, replace) as archive:
+                failed = self._download_pages(
+                    selected,
+                    None,
+                    progress_bar,
+                    replace,
+                    workers,
+                    session,
+                    manifest,
+                    executor,
+                    archive,
+                    **requests_params
+                )
+        else:
+            failed = self._download_pages(
+                selected,
+                chapter_path,
+                progress_bar,
+                replace,
+                workers,
+                session,
+                manifest,
+                executor,
+                **requests_params
+            )
+        if select_all:
+            total_pages = len(self._cached_pages or [])
+            if not failed:
+                manifest.add_chapter(chapter_path, self.url, total_pages)
+        else:
+            total_pages = len(selected)
+        session.events.emit(
+            'chapter_done',
+            manga=self.manga,
+            chapter=self.chapter,
+            pages=total_pages,
+            failed=failed
+        )
+        return failed
+
+    def _get_chapter_path(self, folder: str=None) -> Path:
+        return self.manga._get_manga_path(folder) / filter_forbidden_names(self.name)
+
+    def _get_archive_path(self, folder: str=None) -> Path:
+        return self.manga._get_manga_path(folder) / (filter_forbidden_names(self.name) + '.cbz')
+
+    async def download_async(
+        self,
+        start_page: int=None,
+        end_page: int=None,
+        folder: str=None,
+        replace: bool=False,
+        concurrency: int=10,
+        session=None,
+        pages: str=None,
+        **requests_params
+    ) -> List[ChapterPage]:
+        """
+        Download this chapter asynchronously
+
+        Params
+        --------
+        start_page: :class:`int` (Optional)
+            Set start download in given page number
+        end_page: :class:`int` (Optional)
+            Set finish download in given page number
+        folder: :class:`str` (Optional)
+            Choose folder where you want to store this chapter
+        replace: :class:`bool` (Optional, default: `False`)
+            replace file if exist
+        concurrency: :class:`int` (Optional, default: `10`)
+            Maximum number of requests running at the same time,
+            ignored if `session` is given
+        session: :class:`AsyncMangabatDownloader` (Optional)
+            Use given session instead of creating new one
+        pages: :class:`str` (Optional)
+            Download only given pages, see :meth:`Chapter.download`
+
+        Return
+        --------
+
+        :class:`List[ChapterPage]` pages that failed to download
+        """
+        from .aio import AsyncMangabatDownloader
+
+        if start_page is not None and end_page is not None:
+            if start_page >= end_page:
+                raise ValueError('start_page cannot be same or more than end_page')
+        if pages is not None:
+            parse_range(pages)
+
+        if session is None:
+            async with AsyncMangabatDownloader(concurrency) as session:
+                return await self.download_async(
+                    start_page,
+                    end_page,
+                    folder,
+                    replace,
+                    concurrency,
+                    session,
+                    pages,
+                    **requests_params
+                )
+
+        selected = self._select_pages(
+            await self.get_all_chapter_pages_async(session),
+            start_page,
+            end_page,
+            pages
+        )
+        chapter_path = self._get_chapter_path(folder)
+        chapter_path.mkdir(parents=True, exist_ok=True)
+        results = await asyncio.gather(
+            *[
+                session.download(
+                    page.url,
+                    self.manga,
+                    self.name,
+                    self.chapter,
+                    page.page_filename,
+                    replace=replace,
+                    chapter_path=chapter_path,
+                    **requests_params
+                ) for page in selected
+            ],
+            return_exceptions=True
+        )
+        failed = []
+        for page, result in zip(selected, results):
+            if isinstance(result, BaseException):
+                dl_log.error('Failed to download %s Chapter %s page %s, reason: %s' % (
+                    self.manga.title,
+                    self.chapter,
                     page.page,
-                    start_page
+                    repr(result)
                 ), extra={"type": 'DOWNLOADER'})
-                continue
+                failed.append(page)
+        return failed
+
+    def _select_pages(
+        self,
+        all_pages: List[ChapterPage],
+        start_page: int=None,
+        end_page: int=None,
+        pages: str=None
+    ) -> List[ChapterPage]:
+        # Start downloading all of them
+        if start_page is None and end_page is None and pages is None:
+            return all_pages
+
+        numbers = [page.page for page in all_pages]
+        # Pages are normally sorted already
+        order = sorted(range(len(all_pages)), key=numbers.__getitem__)
+        indexes = select_range(
+            [numbers[i] for i in order],
+            start_page,
+            end_page,
+            None if pages is None else parse_range(pages)
+        )
+        selected = [all_pages[i] for i in sorted(order[i] for i in indexes)]
+        if len(selected) < len(all_pages):
+            dl_log.info('Selected %s of %s pages in %s Chapter %s (start_page: %s, end_page: %s, pages: %s)' % (
+                len(selected),
+                len(all_pages),
+                self.manga.title,
+                self.chapter,
+                start_page,
+                end_page,
+                pages
+            ), extra={"type": 'DOWNLOADER'})
+        return selected
+
+class _ChapterIndex:
+    """
+    Chapters of a manga as parallel arrays sorted by chapter number,
+    :class:`Chapter` objects are created on first access
+    """
+    __slots__ = ('numbers', 'names', 'urls', '_chapters')
+
+    def __init__(self, chapters: List[dict]):
+        # Later duplicates of a chapter number are replacing the earlier ones
+        unique = {}
+        for i in chapters:
+            unique[i['chapter']] = i
+        self.numbers = sorted(unique)
+        self.names = [unique[i]['name'] for i in self.numbers]
+        self.urls = [unique[i]['url'] for i in self.numbers]
+        self._chapters = [None] * len(self.numbers)
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    def get(self, manga, index: int) -> Chapter:
+        chap = self._chapters[index]
+        if chap is None:
+            chap = Chapter(manga, self.names[index], self.numbers[index], self.urls[index])
+            self._chapters[index] = chap
+        return chap
 
 class Manga:
-    def __init__(self, data):
+    """
+    Manga from mangabat.
+
+    If `data` doesn't have all informations (e.g. it's created from :class:`MangaResult`),
+    the manga page is fetched on first access of the missing informations,
+    such as chapters or long description.
+    Chapters are created on first access too.
+
+    Params
+    --------
+    data: :class:`dict`
+        Manga informations
+    session: :class:`MangabatDownloader` (Optional)
+        Session used when the missing informations is fetched
+    """
+    def __init__(self, data, session: MangabatDownloader=None):
         self._data = data
+        self._session = session
+        self._index = None
+        self._lock = threading.RLock()
+
+    @property
+    def is_loaded(self) -> bool:
+        """
+        Is all informations in this manga already fetched ?
+
+        return :class:`bool`
+        """
+        return 'chapters' in self._data
 
-        # add manga class to Chapter class
-        chapters = []
-        for i in data['chapters']:
-            copy = i.copy()
-            copy['manga'] = self
-            chapters.append(copy)
+    def load(self) -> 'Manga':
+        """
+        Fetch all informations in this manga if it's not fetched yet
+
+        return :class:`Manga`
+        """
+        if self.is_loaded:
+            return self
+        with self._lock:
+            if not self.is_loaded:
+                # Manga page is more complete than search result
+                self._data = _fetch(self._data['url'], self._session)
+        return self
+
+    def _get(self, key: str):
+        if key not in self._data:
+            self.load()
+        return self._data[key]
+
+    def _get_index(self) -> _ChapterIndex:
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = _ChapterIndex(self._get('chapters'))
+        return self._index
+
+    def _get_chapter(self, index: int) -> Chapter:
+        chapters = self._get_index()
+        chap = chapters._chapters[index]
+        if chap is None:
+            with self._lock:
+                chap = chapters.get(self, index)
+        return chap
+
+    def _get_chapters(self, indexes: Iterable[int]=None) -> List[Chapter]:
+        chapters = self._get_index()
+        if indexes is None:
+            indexes = range(len(chapters))
+        return [self._get_chapter(i) for i in indexes]
 
-        self._chapters = {i['chapter']: Chapter(i) for i in chapters}
-    
     @property
     def title(self) -> str:
         """
@@ -252,7 +838,7 @@ class Manga:
 
         return :class:`List[str]`
         """
-        return self._data['authors']
+        return self._get('authors')
 
     @property
     def url(self) -> str:
@@ -270,7 +856,7 @@ class Manga:
 
         return :class:`str`
         """
-        return self._data['short_description']
+        return self._get('short_description')
 
     @property
     def long_description(self) -> str:
@@ -279,7 +865,7 @@ class Manga:
 
         return :class:`str`
         """
-        return self._data['long_description']
+        return self._get('long_description')
 
     @property
     def is_trending(self) -> bool:
@@ -288,7 +874,7 @@ class Manga:
 
         return :class:`bool`
         """
-        return self._data['is_trending']
+        return self._get('is_trending')
 
     @property
     def alternative_titles(self) -> List[str]:
@@ -297,7 +883,7 @@ class Manga:
 
         return :class:`List[str]`
         """
-        return self._data['alternative_titles']
+        return self._get('alternative_titles')
 
     @property
     def status(self) -> str:
@@ -306,7 +892,7 @@ class Manga:
 
         return :class:`str`
         """
-        return self._data['status']
+        return self._get('status')
 
     @property
     def genres(self) -> List[str]:
@@ -315,7 +901,7 @@ class Manga:
 
         return :class:`List[str]`
         """
-        return self._data['genres']
+        return self._get('genres')
 
     @property
     def cover_image(self) -> str:
@@ -324,7 +910,7 @@ class Manga:
 
         return :class:`str`
         """
-        return self._data['cover_img']
+        return self._get('cover_img')
 
     @property
     def latest_updated(self) -> datetime:
@@ -333,7 +919,7 @@ class Manga:
 
         return :class:`datetime`
         """
-        return self._data['latest_updated']
+        return self._get('latest_updated')
 
     @property
     def views(self) -> int:
@@ -342,7 +928,7 @@ class Manga:
 
         return :class:`int`
         """
-        return self._data['total_views']
+        return self._get('total_views')
 
     @property
     def chapters(self) -> List[Chapter]:
@@ -351,17 +937,19 @@ class Manga:
 
         return :class:`List[Chapter]`
         """
-        return list(self._chapters.values())
+        return self._get_chapters()
 
     @property
-    def latest_chapter(self) -> float:
+    def latest_chapter(self) -> Chapter:
         """
         Get latest chapter in this manga
 
-        return :class:`float`
+        return :class:`Chapter`
         """
-        latest_chapter = max(list(self._chapters))
-        return self._chapters[latest_chapter]
+        chapters = self._get_index()
+        if not len(chapters):
+            return None
+        return self._get_chapter(len(chapters) - 1)
 
     @property
     def total_chapters(self) -> int:
@@ -370,7 +958,7 @@ class Manga:
 
         return :class:`int`
         """
-        return len(self._chapters)
+        return len(self._get_index())
 
     def to_JSON(self) -> str:
         """
@@ -378,7 +966,7 @@ class Manga:
 
         return :class:`str`
         """
-        data = self._data.copy()
+        data = self.load()._data.copy()
         # datetime object is not JSON serializable
         # so we need convert it to strings
         data['latest_updated'] = data['latest_updated'].strftime('%d %b %Y - %H:%M:%S')
@@ -391,7 +979,7 @@ class Manga:
 
         return :class:`dict`
         """
-        return self._data.copy()
+        return self.load()._data.copy()
 
     def download(
         self,
@@ -401,8 +989,13 @@ class Manga:
         progress_bar: bool=True,
         replace: bool=False,
         mode: str="default",
+        workers: int=1,
+        session: MangabatDownloader=None,
+        prefetch_chapters: int=0,
+        executor: Executor=None,
+        chapters: str=None,
         **requests_params
-    ):
+    ) -> List[ChapterPage]:
         """
         Download this manga
 
@@ -420,112 +1013,456 @@ class Manga:
             replace file if exist
         mode: :class:`str` (Optional, default: `default`)
             Set downloader mode
-            Available options is `default`, `tachiyomi`.
+            Available options is `default`, `tachiyomi`, `cbz`.
 
             `default`:
                 Download in default mode.
             `tachiyomi`:
                 Download for Tachiyomi local / Offline manga
                 https://tachiyomi.org/help/guides/local-manga/#folder-structure
+            `cbz`:
+                Write every chapter into `<chapter>.cbz` archive
+                instead of a folder of images
+        workers: :class:`int` (Optional, default: `1`)
+            Number of pages downloaded at the same time in each chapter
+        session: :class:`MangabatDownloader` (Optional)
+            Use given session instead of creating new one,
+            it will be shared across all chapters and pages
+        prefetch_chapters: :class:`int` (Optional, default: `0`)
+            Number of chapters which the pages will be fetched ahead in background
+            while current chapter is downloading, `0` means disabled
+        executor: :class:`concurrent.futures.Executor` (Optional)
+            Download pages in given executor instead of creating new one
+            for each chapter, `workers` is ignored if this is given
+        chapters: :class:`str` (Optional)
+            Download only given chapters, such as `1-10,15,20-`.
+            Combined with `start_chapter` and `end_chapter` if they're given too
+
+        Return
+        --------
 
+        :class:`List[ChapterPage]` pages that failed to download
         """
         if mode not in DOWNLOAD_MODES:
             raise ValueError('"%s" is not valid download mode' % mode)
         if start_chapter is not None and end_chapter is not None:
             if start_chapter >= end_chapter:
                 raise ValueError('start_chapter cannot be same or more than end_chapter')
+        if chapters is not None:
+            # Invalid range is raised before anything is downloaded
+            parse_range(chapters)
+
+        if session is None:
+            with MangabatDownloader(workers) as session:
+                return self.download(
+                    start_chapter,
+                    end_chapter,
+                    folder,
+                    progress_bar,
+                    replace,
+                    mode,
+                    workers,
+                    session,
+                    prefetch_chapters,
+                    executor,
+                    chapters,
+                    **requests_params
+                )
 
-        # Start downloading all of them
-        if start_chapter is None and end_chapter is None:
-            for chap in self.chapters:
-                chap.download(
-                    folder=folder,
-                    progress_bar=progress_bar,
-                    replace=replace,
+        return self._download_chapters(
+            self._select_chapters(start_chapter, end_chapter, chapters),
+            folder,
+            progress_bar,
+            replace,
+            mode,
+            workers,
+            session,
+            prefetch_chapters,
+            Manifest(self._get_manga_path(folder)),
+            executor,
+            **requests_params
+        )
+
+    def sync(
+        self,
+        folder: str=None,
+        progress_bar: bool=True,
+        mode: str="default",
+        workers: int=1,
+        session: MangabatDownloader=None,
+        prefetch_chapters: int=0,
+        executor: Executor=None,
+        **requests_params
+    ) -> List[ChapterPage]:
+        """
+        Download only new chapters or chapters that are not completely downloaded yet.
+
+        Downloaded chapters are taken from the manifest in the manga folder,
+        so existing pages are not checked to the server.
+
+        Params are same as :meth:`Manga.download`
+
+        Return
+        --------
+
+        :class:`List[ChapterPage]` pages that failed to download
+        """
+        if mode not in DOWNLOAD_MODES:
+            raise ValueError('"%s" is not valid download mode' % mode)
+
+        if session is None:
+            with MangabatDownloader(workers) as session:
+                return self.sync(
+                    folder,
+                    progress_bar,
+                    mode,
+                    workers,
+                    session,
+                    prefetch_chapters,
+                    executor,
                     **requests_params
                 )
+
+        manifest = Manifest(self._get_manga_path(folder))
+        if mode == 'cbz':
+            chapters = [
+                chap for chap in self.chapters
+                if not manifest.is_chapter_complete(chap._get_archive_path(folder))
+            ]
         else:
-            for chap in self.chapters:
-                if chap.chapter >= start_chapter:
-                    if end_chapter is not None:
-                        if chap.chapter <= end_chapter:
-                            chap.download(
-                                folder=folder,
-                                progress_bar=progress_bar,
-                                replace=replace,
-                                **requests_params
-                            )
-                        else:
-                            dl_log.warn('Ignoring chapter %s as param "end_chapter" is %s' % (
-                                chap.chapter,
-                                end_chapter
-                            ), extra={"type": 'DOWNLOADER'})
-                            continue
-                    else:
-                        chap.download(
-                            folder=folder,
-                            progress_bar=progress_bar,
-                            replace=replace,
-                            **requests_params
-                        )
-                else:
-                    dl_log.warn('Ignoring chapter %s as param "start_chapter" is %s' % (
-                        chap.chapter,
-                        start_chapter
-                    ), extra={"type": 'DOWNLOADER'})
-                    continue
+            chapters = [
+                chap for chap in self.chapters
+                if not manifest.is_chapter_complete(chap._get_chapter_path(folder))
+            ]
+        dl_log.info('Found %s new chapter(s) of %s chapters in "%s"' % (
+            len(chapters),
+            self.total_chapters,
+            self.title
+        ), extra={"type": 'DOWNLOADER'})
+
+        return self._download_chapters(
+            chapters,
+            folder,
+            progress_bar,
+            False,
+            mode,
+            workers,
+            session,
+            prefetch_chapters,
+            manifest,
+            executor,
+            **requests_params
+        )
 
-        # Base path
-        if folder is not None:
-            _folder = filter_forbidden_names(folder)
+    def _download_chapters(
+        self,
+        chapters: List[Chapter],
+        folder: str,
+        progress_bar: bool,
+        replace: bool,
+        mode: str,
+        workers: int,
+        session: MangabatDownloader,
+        prefetch_chapters: int,
+        manifest: Manifest,
+        executor: Executor=None,
+        **requests_params
+    ) -> List[ChapterPage]:
+        if prefetch_chapters:
+            # Fetch the chapter pages in background,
+            # so the next chapter is ready when current chapter is finished
+            chapters = prefetch(
+                chapters,
+                lambda chap: chap.get_all_chapter_pages(session),
+                prefetch_chapters
+            )
+
+        # Tachiyomi informations doesn't depend on the chapters,
+        # write them while the chapters are downloading
+        if mode == 'tachiyomi':
+            export_executor = ThreadPoolExecutor(max_workers=1)
+            export = export_executor.submit(self._export_tachiyomi, folder, session)
         else:
-            _folder = None
-        base = Path(_folder or os.getcwd())
+            export_executor = None
+
+        # One progress bar for all pages of this manga
+        p_bar = ProgressBar(session.events, self) if progress_bar else None
+        failed = []
+        try:
+            for chap in chapters:
+                failed.extend(chap.download(
+                    folder=folder,
+                    progress_bar=False,
+                    replace=replace,
+                    workers=workers,
+                    session=session,
+                    manifest=manifest,
+                    executor=executor,
+                    mode=mode,
+                    **requests_params
+                ))
+                manifest.save()
+        finally:
+            manifest.save()
+            if p_bar is not None:
+                p_bar.close()
+            # Still finished even if the chapters are failed
+            if export_executor is not None:
+                export_executor.shutdown(wait=True)
+
+        if failed:
+            dl_log.error('%s page(s) of "%s" failed to download' % (
+                len(failed),
+                self.title
+            ), extra={"type": 'DOWNLOADER'})
 
-        # Folder Manga path
-        manga_path = base / filter_forbidden_names(self.title)
+        if export_executor is not None:
+            export.result()
 
+        return failed
+
+    def _export_tachiyomi(self, folder: str, session: MangabatDownloader):
         # Write some information for Tachiyomi offline manga
-        if mode == 'tachiyomi':
+        manga_path = self._get_manga_path(folder)
+        manga_path.mkdir(parents=True, exist_ok=True)
+        try:
+            dl_log.info('Writing manga "%s" informations in details.json' % (
+                self.title
+            ), extra={"type": 'DOWNLOADER'})
+            self._write_tachiyomi_details(manga_path)
+
             dl_log.info('Downloading cover "%s"' % (
                 self.title
             ), extra={"type": 'DOWNLOADER'})
+            session.save(self.cover_image, manga_path / 'cover.jpg')
+        except Exception as e:
+            dl_log.error('Failed to write Tachiyomi informations of "%s", reason: %s' % (
+                self.title,
+                e
+            ), extra={"type": 'DOWNLOADER'})
+            raise
 
-            # Getting cover img data
-            r = requests.get(self.cover_image)
-            r.raise_for_status()
+    def _write_tachiyomi_details(self, manga_path: Path):
+        # Write to temporary file and then rename it,
+        # so details.json is never half-written
+        path = manga_path / 'details.json'
+        tmp_path = path.with_name(path.name + '.tmp')
+        tmp_path.write_text(json.dumps(self._get_tachiyomi_details()))
+        os.replace(tmp_path, path)
 
-            # Write it
-            (manga_path / 'cover.jpg').write_bytes(r.content)
+    async def download_async(
+        self,
+        start_chapter: int=None,
+        end_chapter: int=None,
+        folder: str=None,
+        replace: bool=False,
+        mode: str="default",
+        concurrency: int=10,
+        limit_per_host: int=0,
+        session=None,
+        chapters: str=None,
+        **requests_params
+    ) -> List[ChapterPage]:
+        """
+        Download this manga asynchronously
 
+        Params
+        --------
+        start_chapter: :class:`int` (Optional)
+            Set start download in given chapter number
+        end_chapter: :class:`int` (Optional)
+            Set finish download in given chapter number
+        folder: :class:`str` (Optional)
+            Choose folder where you want to store this manga
+        replace: :class:`bool` (Optional, default: `False`)
+            replace file if exist
+        mode: :class:`str` (Optional, default: `default`)
+            Set downloader mode, see :meth:`Manga.download`
+        concurrency: :class:`int` (Optional, default: `10`)
+            Maximum number of requests running at the same time,
+            ignored if `session` is given
+        limit_per_host: :class:`int` (Optional, default: `0`)
+            Maximum number of connections to the same host, `0` means no limit.
+            Ignored if `session` is given
+        session: :class:`AsyncMangabatDownloader` (Optional)
+            Use given session instead of creating new one
+        chapters: :class:`str` (Optional)
+            Download only given chapters, see :meth:`Manga.download`
+
+        Return
+        --------
+
+        :class:`List[ChapterPage]` pages that failed to download
+        """
+        from .aio import AsyncMangabatDownloader
+
+        if mode not in DOWNLOAD_MODES:
+            raise ValueError('"%s" is not valid download mode' % mode)
+        if mode == 'cbz':
+            raise ValueError('"cbz" mode is not supported in async download')
+        if start_chapter is not None and end_chapter is not None:
+            if start_chapter >= end_chapter:
+                raise ValueError('start_chapter cannot be same or more than end_chapter')
+        if chapters is not None:
+            parse_range(chapters)
+
+        if session is None:
+            async with AsyncMangabatDownloader(concurrency, limit_per_host) as session:
+                return await self.download_async(
+                    start_chapter,
+                    end_chapter,
+                    folder,
+                    replace,
+                    mode,
+                    concurrency,
+                    limit_per_host,
+                    session,
+                    chapters,
+                    **requests_params
+                )
+
+        # Tachiyomi informations is written while the chapters are downloading
+        if mode == 'tachiyomi':
+            export = asyncio.ensure_future(self._export_tachiyomi_async(folder, session))
+        else:
+            export = None
+
+        # The session semaphore limits how many requests are running,
+        # so all chapters can be scheduled at once
+        try:
+            results = await asyncio.gather(*[
+                chap.download_async(
+                    folder=folder,
+                    replace=replace,
+                    session=session,
+                    **requests_params
+                ) for chap in self._select_chapters(start_chapter, end_chapter, chapters)
+            ])
+        finally:
+            # Still finished even if the chapters are failed
+            if export is not None:
+                await asyncio.wait([export])
+        failed = []
+        for result in results:
+            failed.extend(result)
+
+        if failed:
+            dl_log.error('%s page(s) of "%s" failed to download' % (
+                len(failed),
+                self.title
+            ), extra={"type": 'DOWNLOADER'})
+
+        if export is not None:
+            export.result()
+
+        return failed
+
+    async def _export_tachiyomi_async(self, folder: str, session):
+        manga_path = self._get_manga_path(folder)
+        manga_path.mkdir(parents=True, exist_ok=True)
+        try:
             dl_log.info('Writing manga "%s" informations in details.json' % (
                 self.title
             ), extra={"type": 'DOWNLOADER'})
+            self._write_tachiyomi_details(manga_path)
+
+            dl_log.info('Downloading cover "%s"' % (
+                self.title
+            ), extra={"type": 'DOWNLOADER'})
+            await session.save(self.cover_image, manga_path / 'cover.jpg')
+        except Exception as e:
+            dl_log.error('Failed to write Tachiyomi informations of "%s", reason: %s' % (
+                self.title,
+                e
+            ), extra={"type": 'DOWNLOADER'})
+            raise
+
+    def _select_chapters(
+        self,
+        start_chapter: float=None,
+        end_chapter: float=None,
+        chapters: str=None
+    ) -> List[Chapter]:
+        # Start downloading all of them
+        if start_chapter is None and end_chapter is None and chapters is None:
+            return self.chapters
+
+        index = self._get_index()
+        indexes = select_range(
+            index.numbers,
+            start_chapter,
+            end_chapter,
+            None if chapters is None else parse_range(chapters)
+        )
+        if len(indexes) < len(index):
+            dl_log.info('Selected %s of %s chapters in %s (start_chapter: %s, end_chapter: %s, chapters: %s)' % (
+                len(indexes),
+                len(index),
+                self.title,
+                start_chapter,
+                end_chapter,
+                chapters
+            ), extra={"type": 'DOWNLOADER'})
+        return self._get_chapters(indexes)
+
+    def _get_manga_path(self, folder: str=None) -> Path:
+        # Base path
+        if folder is not None:
+            _folder = filter_forbidden_names(folder)
+        else:
+            _folder = None
+        base = Path(_folder or os.getcwd())
 
-            # This is inside details.json
-            data = {
-                "title": self.title,
-                "author": self.authors,
-                'artist': self.authors,
-                'description': self.long_description,
-                'genre': self.genres,
-                'status': self.status
-            }
+        # Folder is named after title in the manga page,
+        # search result of lazy manga can have different title
+        self.load()
 
-            # Write it
-            (manga_path / 'details.json').write_text(json.dumps(data))
+        # Folder Manga path
+        return base / filter_forbidden_names(self.title)
+
+    def _get_tachiyomi_details(self) -> dict:
+        # This is inside details.json
+        return {
+            "title": self.title,
+            "author": self.authors,
+            'artist': self.authors,
+            'description': self.long_description,
+            'genre': self.genres,
+            'status': self.status
+        }
 
 class MangaResult:
     def __init__(self, data):
         self._data = data
 
-    def fetch(self) -> Manga:
+    def fetch(self, session: MangabatDownloader=None, lazy: bool=False) -> Manga:
         """
         Fetch all informations in this manga
 
+        Params
+        --------
+        session: :class:`MangabatDownloader` (Optional)
+            Use given session instead of creating new one
+        lazy: :class:`bool` (Optional, default: `False`)
+            Don't fetch anything now, the manga page will be fetched
+            on first access of informations that search result doesn't have
+
         return :class:`Manga`
         """
-        data = _fetch(self.url)
+        if lazy:
+            return Manga(self._data.copy(), session)
+        data = _fetch(self.url, session)
+        return Manga(data)
+
+    async def fetch_async(self, session=None) -> Manga:
+        """
+        Fetch all informations in this manga asynchronously
+
+        return :class:`Manga`
+        """
+        from .aio import _async_fetch
+
+        data = await _async_fetch(self.url, session)
         return Manga(data)
 
     def __repr__(self) -> str:
@@ -6,5 +6,28 @@ MANGABAT_SEARCH_URL = MANGABAT_URL + '/search/manga/'
 
 DOWNLOAD_MODES = [
     "default",
-    "tachiyomi"
-]
\ No newline at end of file
+    "tachiyomi",
+    "cbz"
+]
+
+# HTML parsers, fastest first
+PARSERS = [
+    "lxml",
+    "bs4"
+]
+
+# Record of downloaded pages, stored inside manga folder
+MANIFEST_FILENAME = '.mangabat-dl.json'
+
+# How page responses are written, see `MangabatDownloader`
+TRANSFER_MODES = [
+    "tuned",
+    "legacy"
+]
+
+# Buffer size for "tuned" transfer mode
+TRANSFER_BUFFER_SIZE = 256 * 1024
+
+# Pages up to this size (from Content-Length) are read into a preallocated buffer
+# in "tuned" transfer mode, bigger pages are read into a growing buffer
+TRANSFER_PREALLOCATE_LIMIT = 8 * 1024 * 1024
@@ -0,0 +1,142 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Generator, Iterable, Union
+from . import fetcher
+from .classes import Manga, MangaResult
+from .downloader import MangabatDownloader
+from .pipeline import map_ordered
+
+# Called in the parse processes, they must be top-level functions
+# so they can be pickled. Results are plain dicts and lists
+
+def _parse(parser, func, *args):
+    # Use the same parser as the crawler
+    fetcher.set_parser(parser)
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def _parse_search_page(body):
+    results = []
+    fetcher._search_parse_manga(body, results)
+    return results
+
+class Crawler:
+    """
+    Fetch many manga and search pages with threads
+    and parse them in a pool of processes, so parsing is not limited
+    by one CPU core.
+
+    Example ::
+
+        if __name__ == '__main__':
+            with Crawler(workers=16, processes=4) as crawler:
+                for manga in crawler.fetch_many(crawler.search('slime')):
+                    print(manga.title, manga.total_chapters)
+
+    The processes are started with `spawn`, so the script that is using
+    :class:`Crawler` must be guarded by `if __name__ == '__main__'`.
+    The parser when the crawler is created (see :func:`set_parser`) is used in the processes.
+
+    Params
+    --------
+    workers: :class:`int` (Optional, default: `8`)
+        Number of pages fetched at the same time,
+        it should be more than `processes` to keep all processes busy
+    processes: :class:`int` (Optional)
+        Number of parse processes, default to number of CPU cores
+    session: :class:`MangabatDownloader` (Optional)
+        Use given session instead of creating new one
+    """
+    def __init__(
+        self,
+        workers: int=8,
+        processes: int=None,
+        session: MangabatDownloader=None
+    ):
+        self.workers = workers
+        self.processes = processes or os.cpu_count() or 1
+        self._own_session = session is None
+        self.session = MangabatDownloader(workers) if session is None else session
+        self._parser = fetcher.get_parser()
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Stop the parse processes and close the session if it's created by this crawler"""
+        self._pool.shutdown()
+        if self._own_session:
+            self.session.close()
+
+    def _parse_page(self, url: str, kind: str, func, *args):
+        result, duration = self._pool.submit(_parse, self._parser, func, *args).result()
+        self.session.events.emit('parse', url=url, kind=kind, duration=duration)
+        return result
+
+    def fetch(self, mangabat_url: str) -> Manga:
+        """
+        Fetch mangabat url
+
+        return :class:`Manga`
+        """
+        body = fetcher._get_html(mangabat_url, self.session)
+        return Manga(self._parse_page(mangabat_url, 'manga', fetcher._parse_manga, body))
+
+    def fetch_many(self, results: Iterable[Union[MangaResult, str]]) -> Generator[Manga, Any, Any]:
+        """
+        Fetch many manga, up to `workers` at the same time
+
+        Params
+        --------
+        results: :class:`Iterable[Union[MangaResult, str]]`
+            Search results or mangabat urls
+
+        return :class:`Iterator[Manga]` in same order as `results`
+        """
+        def fetch_one(result):
+            url = result.url if isinstance(result, MangaResult) else result
+            return self.fetch(url)
+
+        yield from map_ordered(results, fetch_one, self.workers)
+
+    def search(
+        self,
+        query: str,
+        max_pages: int=None,
+        max_results: int=None
+    ) -> Generator[MangaResult, Any, Any]:
+        """
+        Search manga, result pages are fetched up to `workers` at the same time
+
+        Params
+        --------
+        query: :class:`str`
+            Manga to search
+        max_pages: :class:`int` (Optional)
+            Stop after given number of result pages
+        max_results: :class:`int` (Optional)
+            Stop after given number of results
+
+        return :class:`Iterator[MangaResult]`
+        """
+        url = fetcher._search_url(query)
+        body = fetcher._get_html(url, self.session)
+        results, pages = self._parse_page(url, 'search', fetcher._parse_search_first_page, body, query)
+
+        def fetch_page(page):
+            body = fetcher._get_html(page, self.session)
+            return self._parse_page(page, 'search', _parse_search_page, body)
+
+        # Same pagination as search_iter(), first page is already parsed
+        for data in fetcher._paginate(results, pages, fetch_page, self.workers, max_pages, max_results):
+            yield MangaResult(data)
@@ -1,15 +1,122 @@
+import http.client
+import io
 import os
 import requests
+import threading
 import time
+import hashlib
 import re
 import tqdm
 import logging
 from pathlib import Path
+from requests.adapters import HTTPAdapter, DEFAULT_POOLSIZE
+from urllib3.exceptions import HTTPError as _Urllib3HTTPError
+from .cache import ResponseCache
+from .constants import TRANSFER_MODES, TRANSFER_BUFFER_SIZE, TRANSFER_PREALLOCATE_LIMIT
+from .errors import DownloadIncomplete
+from .events import Events
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+from .store import ImageStore
 from .utils import filter_forbidden_names
 
 log = logging.getLogger(__name__)
 log.setLevel(logging.CRITICAL)
 
+_REGEX_PAGE_NUMBER = re.compile(r'[0-9]{1,}')
+_REGEX_CONTENT_RANGE = re.compile(r'^bytes ([0-9]+)-([0-9]+)/([0-9]+|\*)$')
+
+def _get_part_path(file_path: Path) -> Path:
+    return file_path.with_name(file_path.name + '.part')
+
+def _get_validator_path(part_path: Path) -> Path:
+    # ETag or Last-Modified of the response that is written in `.part` file
+    return part_path.with_name(part_path.name + '.validator')
+
+def _get_validator(headers) -> str:
+    # Weak ETag cannot be used in If-Range
+    etag = headers.get('ETag')
+    if etag is not None and not etag.startswith('W/'):
+        return etag
+    return headers.get('Last-Modified')
+
+def _read_validator(validator_path: Path) -> str:
+    try:
+        return validator_path.read_text() or None
+    except FileNotFoundError:
+        return None
+
+def _write_validator(validator_path: Path, validator: str=None):
+    if validator is None:
+        if os.path.exists(validator_path):
+            os.remove(validator_path)
+        return
+    validator_path.write_text(validator)
+
+def _get_range_start(headers) -> int:
+    match = _REGEX_CONTENT_RANGE.match(headers.get('Content-Range', ''))
+    if match is None:
+        return None
+    return int(match.group(1))
+
+def _resolve_chapter_path(folder: str, name_manga: str, name_chapter: str) -> Path:
+    # Chapter.download() resolves and creates the folder once for all pages,
+    # this is only used when a page is downloaded by itself
+    # Base path
+    if folder is not None:
+        _folder = filter_forbidden_names(folder)
+    else:
+        _folder = None
+    base = Path(_folder or os.getcwd())
+
+    # Folder Manga path
+    manga_path = base / filter_forbidden_names(name_manga)
+
+    # Folder chapter path
+    chapter_path = manga_path / filter_forbidden_names(name_chapter)
+    chapter_path.mkdir(parents=True, exist_ok=True)
+    return chapter_path
+
+def _get_readinto(r):
+    # urllib3 `readinto` is reading new bytes object and copy it,
+    # the http.client response under it can read straight into the buffer.
+    # This uses urllib3 private `_fp` attribute (tested with urllib3 2.8),
+    # anything else falls back to the public `readinto`.
+    # It can only be used if the body is not encoded (gzip, etc).
+    # urllib3 doesn't count the bytes read this way, so the caller must check
+    # the size with Content-Length and release the connection (see `_release_response`)
+    fp = getattr(r.raw, '_fp', None)
+    if isinstance(fp, http.client.HTTPResponse) and not r.headers.get('Content-Encoding'):
+        return fp.readinto, True
+    return r.raw.readinto, False
+
+def _readinto(r, readinto, direct: bool, view: memoryview) -> int:
+    try:
+        return readinto(view)
+    except (http.client.HTTPException, OSError) as e:
+        if not direct:
+            raise
+        # Same as urllib3 errors, so it can be retried
+        r.close()
+        raise DownloadIncomplete('Connection broken: %r' % e)
+
+def _release_response(r, direct: bool):
+    # urllib3 put the connection back to the pool after it read whole body,
+    # but it doesn't know if the body is read from http.client response
+    if direct:
+        r.raw.release_conn()
+
+class _PageProgress:
+    def __init__(self, events: Events, p_bar, event: dict):
+        self.events = events
+        self.p_bar = p_bar
+        self.event = event
+
+    def update(self, n: int):
+        if self.p_bar is not None:
+            self.p_bar.update(n)
+        self.events.emit('bytes_received', size=n, **self.event)
+
 class MangabatDownloader(requests.Session):
     """
     The way its download it copied from https://github.com/choldgraf/download
@@ -18,7 +125,111 @@ class MangabatDownloader(requests.Session):
     doesn't support custom headers argument
     """
     _headers = {"referer": "https://read.mangabat.com/"}
-        
+
+    def __init__(
+        self,
+        workers: int=1,
+        adapter: HTTPAdapter=None,
+        retry_policy: RetryPolicy=None,
+        rate_limiter: RateLimiter=None,
+        cache: ResponseCache=None,
+        store: ImageStore=None,
+        transfer_mode: str="tuned",
+        events: Events=None
+    ):
+        """
+        Params
+        --------
+        workers: :class:`int` (Optional, default: `1`)
+            Number of threads that will share this session,
+            the connection pool is sized to it
+        adapter: :class:`requests.adapters.HTTPAdapter` (Optional)
+            Use custom transport adapter instead of the default one
+        retry_policy: :class:`RetryPolicy` (Optional)
+            Retry failed requests with given policy, default to `RetryPolicy()`.
+            Use `RetryPolicy(0)` to disable it
+        rate_limiter: :class:`RateLimiter` (Optional)
+            Limit requests per second for each host
+        cache: :class:`ResponseCache` (Optional)
+            Cache manga, chapter and search pages in given cache
+        store: :class:`ImageStore` (Optional)
+            Store downloaded pages once in given store and link them
+            into the chapter folders
+        transfer_mode: :class:`str` (Optional, default: `tuned`)
+            How page responses are written.
+            Available options is `tuned`, `legacy`.
+
+            `tuned`:
+                Read into reusable buffer of each thread, without creating
+                new bytes object for every chunk
+            `legacy`:
+                Read new chunk for every write, the chunk size is
+                adapted from how long the read take
+        events: :class:`Events` (Optional)
+            Use given events instead of creating new one,
+            it's available in `events` attribute
+        """
+        if transfer_mode not in TRANSFER_MODES:
+            raise ValueError('"%s" is not valid transfer mode' % transfer_mode)
+        super().__init__()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.cache = cache
+        self.store = store
+        self.transfer_mode = transfer_mode
+        self.events = Events() if events is None else events
+        self._local = threading.local()
+        if adapter is None:
+            pool_size = max(workers or 1, DEFAULT_POOLSIZE)
+            adapter = HTTPAdapter(
+                pool_connections=pool_size,
+                pool_maxsize=pool_size
+            )
+        self.mount('https://', adapter)
+        self.mount('http://', adapter)
+
+    def request(self, method, url, *args, **kwargs):
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(url)
+
+            try:
+                r = super().request(method, url, *args, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if not self.retry_policy.can_retry(attempt):
+                    raise
+                reason = e
+                headers = None
+            else:
+                self.events.emit(
+                    'request',
+                    method=method,
+                    url=url,
+                    status=r.status_code,
+                    duration=r.elapsed.total_seconds()
+                )
+                if (
+                    not self.retry_policy.is_retryable_status(r.status_code) or
+                    not self.retry_policy.can_retry(attempt)
+                ):
+                    return r
+                reason = 'HTTP %s' % r.status_code
+                headers = r.headers
+                r.close()
+
+            delay = self.retry_policy.get_backoff(attempt, headers)
+            attempt += 1
+            self.events.emit('retry', url=url, attempt=attempt, delay=delay, reason=reason)
+            log.warning('Request to %s failed (%s), retrying in %.2f seconds (%s/%s)' % (
+                url,
+                reason,
+                delay,
+                attempt,
+                self.retry_policy.total
+            ), extra={"type": 'DOWNLOADER'})
+            time.sleep(delay)
+
     def download(
         self,
         url: str,
@@ -29,36 +240,191 @@ class MangabatDownloader(requests.Session):
         folder: str=None,
         progress_bar: bool=True,
         replace: bool=True,
+        manifest=None,
+        chapter_path: Path=None,
         **requests_params
     ):
-        name_manga = manga.title
-        page = re.compile(r'[0-9]{1,}').search(name_file).group()
-        # Base path
-        if folder is not None:
-            _folder = filter_forbidden_names(folder)
-        else:
-            _folder = None
-        base = Path(_folder or os.getcwd())
+        if chapter_path is None:
+            chapter_path = _resolve_chapter_path(folder, manga.title, name_chapter)
+        return self._retry_download(url, lambda resume: self._download(
+            url,
+            manga,
+            name_chapter,
+            chapter,
+            name_file,
+            chapter_path,
+            progress_bar,
+            replace,
+            manifest,
+            resume,
+            **requests_params
+        ))
 
-        # Folder Manga path
-        manga_path = base / filter_forbidden_names(name_manga)
+    def save(self, url: str, file_path: Path, **requests_params) -> int:
+        """
+        Download given url into `file_path` without keeping it in memory.
+        The file is written to `<file_path>.part` and renamed after it's complete
 
-        # Folder chapter path
-        chapter_path = manga_path / filter_forbidden_names(name_chapter)
-        chapter_path.mkdir(parents=True, exist_ok=True)
+        return :class:`int` size of the file
+        """
+        file_path = Path(file_path)
+        part_path = _get_part_path(file_path)
+
+        def save_file(resume):
+            r = self.get(url, headers=self._headers, stream=True, **requests_params)
+            r.raise_for_status()
+            with open(part_path, 'wb') as local_file:
+                file_size = self._copy_response(r, local_file)
+            file_sizes = r.headers.get('Content-Length')
+            if file_sizes is not None and file_size != int(file_sizes):
+                raise DownloadIncomplete('%s is incomplete, received %s of %s bytes' % (
+                    url,
+                    file_size,
+                    file_sizes
+                ))
+            os.replace(part_path, file_path)
+            return file_size
+
+        return self._retry_download(url, save_file)
+
+    def download_bytes(
+        self,
+        url: str,
+        manga,
+        chapter: float,
+        name_file: str,
+        progress_bar: bool=True,
+        **requests_params
+    ) -> bytes:
+        """
+        Download a page into memory instead of a file,
+        the page is returned only if it's completely received
+
+        return :class:`bytes`
+        """
+        return self._retry_download(url, lambda resume: self._download_bytes(
+            url,
+            manga,
+            chapter,
+            name_file,
+            progress_bar,
+            **requests_params
+        ))
+
+    def _retry_download(self, url: str, func):
+        attempt = 0
+        while True:
+            try:
+                return func(attempt > 0)
+            # Connection is broken while receiving the file,
+            # next attempt will continue from the unfinished file
+            except (_Urllib3HTTPError, DownloadIncomplete) as e:
+                if not self.retry_policy.can_retry(attempt):
+                    raise
+                delay = self.retry_policy.get_backoff(attempt)
+                attempt += 1
+                self.events.emit('retry', url=url, attempt=attempt, delay=delay, reason=e)
+                log.warning('Download %s failed (%s), retrying in %.2f seconds (%s/%s)' % (
+                    url,
+                    e,
+                    delay,
+                    attempt,
+                    self.retry_policy.total
+                ), extra={"type": 'DOWNLOADER'})
+                time.sleep(delay)
+
+    def _download(
+        self,
+        url: str,
+        manga,
+        name_chapter: str,
+        chapter: float,
+        name_file: str,
+        chapter_path: Path,
+        progress_bar: bool=True,
+        replace: bool=True,
+        manifest=None,
+        resume: bool=False,
+        **requests_params
+    ):
+        started = time.perf_counter()
+        name_manga = manga.title
+        page = _REGEX_PAGE_NUMBER.search(name_file).group()
+        event = {'url': url, 'manga': manga, 'chapter': chapter, 'page': int(page)}
 
         # File images chapter path
         file_path = chapter_path / name_file
 
+        # Check if this file is already downloaded
+        # without asking the server
+        if manifest is not None and not replace:
+            if manifest.is_complete(file_path):
+                log.info('%s Chapter %s Page %s is already downloaded, skipping...' % (
+                    name_manga,
+                    chapter,
+                    page
+                ), extra={"type": 'DOWNLOADER'})
+                self.events.emit(
+                    'page_done',
+                    size=os.path.getsize(file_path),
+                    skipped=True,
+                    duration=time.perf_counter() - started,
+                    **event
+                )
+                return
+
+        # Unfinished download is stored in here
+        # and renamed to the real path after it's complete
+        part_path = _get_part_path(file_path)
+        validator_path = _get_validator_path(part_path)
+
+        # Continue unfinished download, if the file is not exist yet
+        # or previous attempt is failed in the middle of download.
+        # It can be continued only if the server can tell
+        # the file is not changed since then (ETag or Last-Modified)
+        offset = 0
+        validator = None
+        if resume or (not replace and not os.path.exists(file_path)):
+            if os.path.exists(part_path):
+                validator = _read_validator(validator_path)
+                if validator is not None:
+                    offset = os.stat(part_path).st_size
+
         # Make request
-        r = self.get(url, headers=self._headers, stream=True, **requests_params)
+        headers = self._headers.copy()
+        if offset:
+            headers['Range'] = 'bytes=%s-' % offset
+            # The server send the whole file if it's changed
+            headers['If-Range'] = validator
+        r = self.get(url, headers=headers, stream=True, **requests_params)
+
+        # The unfinished file is bigger than the server has,
+        # or the server send different part than requested
+        if offset and (
+            r.status_code == 416 or
+            (r.status_code == 206 and _get_range_start(r.headers) != offset)
+        ):
+            log.warning('%s Chapter %s Page %s cannot be resumed from %s bytes, starting from beginning' % (
+                name_manga,
+                chapter,
+                page,
+                offset
+            ), extra={"type": 'DOWNLOADER'})
+            r.close()
+            offset = 0
+            r = self.get(url, headers=self._headers, stream=True, **requests_params)
         r.raise_for_status()
 
+        # Server doesn't support range requests or the file is changed,
+        # start from beginning
+        if offset and r.status_code != 206:
+            offset = 0
+
         # Get file size
-        file_sizes = float(r.headers['Content-Length'])
+        file_sizes = float(r.headers['Content-Length']) + offset
 
         # Check if this file exist and have same file size
-        if os.path.exists(file_path):
+        if not resume and os.path.exists(file_path):
             stat = os.stat(file_path)
             if file_sizes == stat.st_size:
                 if not replace:
@@ -67,6 +433,16 @@ class MangabatDownloader(requests.Session):
                         chapter,
                         page
                     ), extra={"type": 'DOWNLOADER'})
+                    r.close()
+                    if manifest is not None:
+                        manifest.add(file_path, url, stat.st_size)
+                    self.events.emit(
+                        'page_done',
+                        size=stat.st_size,
+                        skipped=True,
+                        duration=time.perf_counter() - started,
+                        **event
+                    )
                     return
             else:
                 log.warning('File is exist but %s Chapter %s Page %s size doesn\'t match as the server has, re-downloading...' % (
@@ -75,15 +451,118 @@ class MangabatDownloader(requests.Session):
                     page
                 ), extra={"type": 'DOWNLOADER'})
 
+        if offset:
+            log.info('Resuming download %s Chapter %s page %s from %s bytes' % (
+                name_manga,
+                chapter,
+                page,
+                offset
+            ), extra={"type": 'DOWNLOADER'})
+        else:
+            log.info('Starting download %s Chapter %s page %s' % (
+                name_manga,
+                chapter,
+                page
+            ), extra={"type": 'DOWNLOADER'})
+
+        # The parameters was adapted from 
+        # https://github.com/choldgraf/download/blob/master/download/download.py#L366
+        # Setting up progress bar
+        if progress_bar:
+            p_bar = tqdm.tqdm(
+                desc='file_sizes',
+                total=file_sizes,
+                initial=offset,
+                unit='B',
+                unit_scale=True,
+                ncols=80
+            )
+        else:
+            p_bar = None
+        self.events.emit('page_started', size=int(file_sizes), offset=offset, **event)
+        progress = self._get_progress(p_bar, event)
+
+        file_hash = hashlib.sha256()
+        file_size = offset
+        if not offset:
+            # Written only when `.part` file is written,
+            # so skipped pages don't leave it behind
+            _write_validator(validator_path, _get_validator(r.headers))
+        else:
+            with open(part_path, 'rb') as part_file:
+                for chunk in iter(lambda: part_file.read(65536), b''):
+                    file_hash.update(chunk)
+        try:
+            # `.part` file is never preallocated, its size is what's received
+            # so it can be continued after the process is killed
+            with open(part_path, "r+b" if offset else "wb") as local_file:
+                local_file.seek(offset)
+                file_size += self._copy_response(r, local_file, file_hash, progress)
+        finally:
+            # Close the progress bar, even if the download is failed and retried
+            if p_bar is not None:
+                p_bar.close()
+
+        # Connection is closed before all data is received,
+        # keep the unfinished file so it can be continued later
+        if file_size != file_sizes:
+            raise DownloadIncomplete('%s Chapter %s page %s is incomplete, received %s of %s bytes' % (
+                name_manga,
+                chapter,
+                page,
+                file_size,
+                int(file_sizes)
+            ))
+
+        if self.store is not None:
+            self.store.add(part_path, file_path, file_hash.hexdigest())
+        else:
+            os.replace(part_path, file_path)
+        _write_validator(validator_path, None)
+
+        if manifest is not None:
+            manifest.add(file_path, url, file_size, file_hash.hexdigest())
+
+        self.events.emit(
+            'page_done',
+            size=file_size,
+            skipped=False,
+            duration=time.perf_counter() - started,
+            **event
+        )
+
+        log.info('Finished download %s Chapter %s page %s' % (
+            name_manga,
+            chapter,
+            page
+        ), extra={"type": 'DOWNLOADER'})
+
+    def _download_bytes(
+        self,
+        url: str,
+        manga,
+        chapter: float,
+        name_file: str,
+        progress_bar: bool=True,
+        **requests_params
+    ) -> bytes:
+        started = time.perf_counter()
+        name_manga = manga.title
+        page = _REGEX_PAGE_NUMBER.search(name_file).group()
+        event = {'url': url, 'manga': manga, 'chapter': chapter, 'page': int(page)}
+
         log.info('Starting download %s Chapter %s page %s' % (
             name_manga,
             chapter,
             page
         ), extra={"type": 'DOWNLOADER'})
 
-        # The parameters was adapted from 
-        # https://github.com/choldgraf/download/blob/master/download/download.py#L366
-        # Setting up progress bar
+        r = self.get(url, headers=self._headers, stream=True, **requests_params)
+        r.raise_for_status()
+
+        # Get file size
+        file_sizes = float(r.headers['Content-Length'])
+
         if progress_bar:
             p_bar = tqdm.tqdm(
                 desc='file_sizes',
@@ -94,31 +573,110 @@ class MangabatDownloader(requests.Session):
             )
         else:
             p_bar = None
+        self.events.emit('page_started', size=int(file_sizes), offset=0, **event)
+        progress = self._get_progress(p_bar, event)
 
-        # This was also adapted from 
-        # https://github.com/choldgraf/download/blob/master/download/download.py#L377
-        chunk_size = 8192  # 2 ** 13
-        with open(file_path, "wb") as local_file:
-            while True:
-                t0 = time.time()
-                chunk = r.raw.read(chunk_size)
-                dt = time.time() - t0
-                if dt < 0.005:
-                    chunk_size *= 2
-                elif dt > 0.1 and chunk_size > 8192:
-                    chunk_size = chunk_size // 2
-                if not chunk:
-                    break
-                local_file.write(chunk)
-                if p_bar is not None:
-                    p_bar.update(len(chunk))
-
-        # Close the progress bar
-        if p_bar is not None:
-            p_bar.close()
+        try:
+            # Content-Length is not trusted for allocating more than the limit
+            if self.transfer_mode == 'tuned' and file_sizes <= TRANSFER_PREALLOCATE_LIMIT:
+                # Read straight into the returned buffer
+                data = bytearray(int(file_sizes))
+                file_size = self._readinto_response(r, memoryview(data), progress)
+                del data[file_size:]
+            else:
+                data = io.BytesIO()
+                file_size = self._copy_response(r, data, None, progress)
+                data = data.getvalue()
+        finally:
+            if p_bar is not None:
+                p_bar.close()
+
+        # Connection is closed before all data is received
+        if file_size != file_sizes:
+            raise DownloadIncomplete('%s Chapter %s page %s is incomplete, received %s of %s bytes' % (
+                name_manga,
+                chapter,
+                page,
+                file_size,
+                int(file_sizes)
+            ))
 
         log.info('Finished download %s Chapter %s page %s' % (
             name_manga,
             chapter,
             page
         ), extra={"type": 'DOWNLOADER'})
+        self.events.emit(
+            'page_done',
+            size=file_size,
+            skipped=False,
+            duration=time.perf_counter() - started,
+            **event
+        )
+        return data
+
+    def _get_progress(self, p_bar, event: dict):
+        # Received bytes go to the page progress bar and "bytes_received" event
+        if not self.events.has('bytes_received'):
+            return p_bar
+        return _PageProgress(self.events, p_bar, event)
+
+    def _copy_response(self, r, local_file, file_hash=None, p_bar=None) -> int:
+        if self.transfer_mode == 'legacy':
+            return self._copy_response_legacy(r, local_file, file_hash, p_bar)
+
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            buffer = self._local.buffer = memoryview(bytearray(TRANSFER_BUFFER_SIZE))
+
+        readinto, direct = _get_readinto(r)
+        file_size = 0
+        while True:
+            n = _readinto(r, readinto, direct, buffer)
+            if not n:
+                break
+            chunk = buffer[:n]
+            local_file.write(chunk)
+            if file_hash is not None:
+                file_hash.update(chunk)
+            file_size += n
+            if p_bar is not None:
+                p_bar.update(n)
+        _release_response(r, direct)
+        return file_size
+
+    def _readinto_response(self, r, view: memoryview, p_bar=None) -> int:
+        readinto, direct = _get_readinto(r)
+        file_size = 0
+        while file_size < len(view):
+            n = _readinto(r, readinto, direct, view[file_size:file_size + TRANSFER_BUFFER_SIZE])
+            if not n:
+                break
+            file_size += n
+            if p_bar is not None:
+                p_bar.update(n)
+        _release_response(r, direct)
+        return file_size
+
+    def _copy_response_legacy(self, r, local_file, file_hash=None, p_bar=None) -> int:
+        # This was also adapted from 
+        # https://github.com/choldgraf/download/blob/master/download/download.py#L377
+        chunk_size = 8192  # 2 ** 13
+        file_size = 0
+        while True:
+            t0 = time.time()
+            chunk = r.raw.read(chunk_size)
+            dt = time.time() - t0
+            if dt < 0.005:
+                chunk_size *= 2
+            elif dt > 0.1 and chunk_size > 8192:
+                chunk_size = chunk_size // 2
+            if not chunk:
+                break
+            local_file.write(chunk)
+            if file_hash is not None:
+                file_hash.update(chunk)
+            file_size += len(chunk)
+            if p_bar is not None:
+                p_bar.update(len(chunk))
+        return file_size
@@ -8,4 +8,10 @@ class Mangabat404(Exception):
     """
     Raised when the page looking for is not found
     """
-    pass
\ No newline at end of file
+    pass
+
+class DownloadIncomplete(Exception):
+    """
+    Raised when connection is closed before the whole file is received
+    """
+    pass
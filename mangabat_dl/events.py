@@ -0,0 +1,77 @@
+import logging
+import threading
+from typing import Callable
+
+log = logging.getLogger('mangabat_dl.downloader')
+
+# Every event and the keyword arguments that the callbacks receive,
+# callbacks should accept `**kwargs` as more arguments can be added later
+EVENTS = {
+    # Page download is started, `size` is the total size
+    # and `offset` is the size that is already downloaded before
+    "page_started": ('url', 'manga', 'chapter', 'page', 'size', 'offset'),
+    # Part of page is received
+    "bytes_received": ('url', 'manga', 'chapter', 'page', 'size'),
+    # Page is finished, `skipped` is `True` if it's already downloaded before
+    "page_done": ('url', 'manga', 'chapter', 'page', 'size', 'skipped', 'duration'),
+    # All pages of chapter is finished, `failed` is list of failed pages
+    "chapter_done": ('manga', 'chapter', 'pages', 'failed'),
+    # Failed request or download that will be tried again
+    "retry": ('url', 'attempt', 'delay', 'reason'),
+    # Page failed to download
+    "error": ('url', 'manga', 'chapter', 'page', 'error'),
+    # Request is finished (including retried requests)
+    "request": ('method', 'url', 'status', 'duration'),
+    # Manga, chapter or search page is parsed, `kind` is `manga`, `chapter` or `search`
+    "parse": ('url', 'kind', 'duration'),
+}
+
+class Events:
+    """
+    Callbacks for download events, every :class:`MangabatDownloader` have one in `events` attribute.
+
+    Example ::
+
+        def page_done(manga, chapter, page, size, **kwargs):
+            print('%s chapter %s page %s done' % (manga.title, chapter, page))
+
+        session.events.on('page_done', page_done)
+
+    Callbacks are called from the downloading threads,
+    they should be fast and thread-safe. See `EVENTS` for all events.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._callbacks = {}
+
+    def on(self, event: str, callback: Callable[..., None]):
+        """Call `callback` every time `event` is happened"""
+        if event not in EVENTS:
+            raise ValueError('"%s" is not valid event' % event)
+        with self._lock:
+            # Copy on write, so emit() doesn't need the lock
+            self._callbacks[event] = self._callbacks.get(event, ()) + (callback,)
+
+    def off(self, event: str, callback: Callable[..., None]):
+        """Remove `callback` from `event`"""
+        with self._lock:
+            callbacks = list(self._callbacks.get(event, ()))
+            if callback in callbacks:
+                callbacks.remove(callback)
+            self._callbacks[event] = tuple(callbacks)
+
+    def has(self, event: str) -> bool:
+        """Check if there is any callback for `event`"""
+        return bool(self._callbacks.get(event))
+
+    def emit(self, event: str, **data):
+        for callback in self._callbacks.get(event, ()):
+            try:
+                callback(**data)
+            except Exception as e:
+                # Broken callback must not break the download
+                log.error('Callback %r of event "%s" failed: %r' % (
+                    callback,
+                    event,
+                    e
+                ), extra={"type": 'DOWNLOADER'})
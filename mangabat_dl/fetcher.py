@@ -1,33 +1,212 @@
-import requests
 import bs4
+import html.parser
 import urllib.parse
 import io
+import math
 import re
 import logging
+import time
 from datetime import datetime
 from .utils import convert_query_search
-from .constants import MANGABAT_SEARCH_URL
+from .constants import MANGABAT_SEARCH_URL, PARSERS
 from .errors import MangaNotFound, Mangabat404
+from .downloader import MangabatDownloader
+from .pipeline import map_ordered
+from . import lxml_parser
 
 log = logging.getLogger(__name__)
 
-def _fetch_chapter_images(chapter_url):
-    r = requests.get(chapter_url)
+_parser = None
+
+def set_parser(name: str=None):
+    """
+    Set HTML parser used for manga, chapter and search pages
+
+    Params
+    --------
+    name: :class:`str` (Optional)
+        Available options is `lxml`, `bs4`.
+        If not given, `lxml` is used if it's installed, otherwise `bs4`.
+
+        `lxml`:
+            Fast parser, requires lxml to be installed.
+        `bs4`:
+            BeautifulSoup with built-in `html.parser`, slow but always available.
+    """
+    global _parser
+    if name is not None and name not in PARSERS:
+        raise ValueError('"%s" is not valid parser' % name)
+    if name == 'lxml' and lxml_parser.lxml is None:
+        raise ImportError('lxml parser requires lxml, install it with "pip install mangabat-dl[lxml]"')
+    _parser = name
+
+def get_parser() -> str:
+    """
+    Get HTML parser used for manga, chapter and search pages
+
+    return :class:`str`
+    """
+    if _parser is not None:
+        return _parser
+    if lxml_parser.lxml is not None:
+        return 'lxml'
+    return 'bs4'
+
+def _get_html(url, session=None):
+    if session is None:
+        with MangabatDownloader() as s:
+            return _get_html(url, s)
+
+    cache = session.cache
+    if cache is None:
+        r = session.get(url)
+        r.raise_for_status()
+        return r.text
+
+    entry = cache.get(url)
+    if entry is not None and cache.is_fresh(entry):
+        return entry.body
+
+    # Ask the server if cached page is still valid
+    headers = {}
+    if entry is not None:
+        if entry.etag is not None:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified is not None:
+            headers['If-Modified-Since'] = entry.last_modified
+    r = session.get(url, headers=headers)
+    if entry is not None and r.status_code == 304:
+        cache.touch(entry)
+        return entry.body
     r.raise_for_status()
-    parser = bs4.BeautifulSoup(r.text, 'html.parser')
+
+    cache.set(url, r.text, r.headers.get('ETag'), r.headers.get('Last-Modified'))
+    return r.text
+
+def _bs4_parse_chapter_images(body):
+    parser = bs4.BeautifulSoup(body, 'html.parser')
     urls = []
     for element in parser.find('div', attrs={'class': ['container-chapter-reader']}).find_all('img'):
         urls.append(element.attrs['src'])
     return urls
 
-def _fetch(mangabat_url):
-    r = requests.get(mangabat_url)
-    r.raise_for_status()
+def _parse_page(session, url, kind, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    if session is not None:
+        session.events.emit('parse', url=url, kind=kind, duration=time.perf_counter() - start)
+    return result
+
+def _fetch_chapter_images(chapter_url, session=None):
+    body = _get_html(chapter_url, session)
+    return _parse_page(session, chapter_url, 'chapter', _parse_chapter_images, body)
+
+class _ChapterImagesParser(html.parser.HTMLParser):
+    """Find images inside `container-chapter-reader` from partial HTML"""
+    def __init__(self):
+        super().__init__()
+        self.found = False
+        self.done = False
+        self._depth = 0
+        self._images = []
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if self._depth:
+            if tag == 'div':
+                self._depth += 1
+            elif tag == 'img':
+                src = dict(attrs).get('src')
+                if src is not None:
+                    self._images.append(src)
+        elif tag == 'div':
+            classes = dict(attrs).get('class') or ''
+            if 'container-chapter-reader' in classes.split():
+                self.found = True
+                self._depth = 1
+
+    def handle_endtag(self, tag):
+        if self._depth and tag == 'div':
+            self._depth -= 1
+            if not self._depth:
+                self.done = True
+
+    def pop_images(self):
+        images = self._images
+        self._images = []
+        return images
+
+def _iter_chapter_images(chapter_url, session=None):
+    """
+    Yield chapter images while the chapter page is still downloading,
+    and stop downloading after all images is found
+    """
+    if session is None:
+        with MangabatDownloader() as session:
+            yield from _iter_chapter_images(chapter_url, session)
+        return
+
+    # Cached page must be downloaded completely
+    if session.cache is not None:
+        yield from _fetch_chapter_images(chapter_url, session)
+        return
+
+    r = session.get(chapter_url, stream=True)
+    try:
+        r.raise_for_status()
+        if r.encoding is None:
+            r.encoding = 'utf-8'
+        parser = _ChapterImagesParser()
+        # Only time spent in the parser, not in the network
+        duration = 0
+        for text in r.iter_content(chunk_size=8192, decode_unicode=True):
+            start = time.perf_counter()
+            parser.feed(text)
+            duration += time.perf_counter() - start
+            yield from parser.pop_images()
+            if parser.done:
+                break
+        else:
+            parser.close()
+            yield from parser.pop_images()
+    finally:
+        r.close()
+
+    session.events.emit('parse', url=chapter_url, kind='chapter', duration=duration)
+    if not parser.found:
+        raise Mangabat404('chapter images in "%s" cannot be found' % chapter_url)
+
+def _fetch(mangabat_url, session=None):
+    body = _get_html(mangabat_url, session)
+    return _parse_page(session, mangabat_url, 'manga', _parse_manga, body)
 
+def _parse_chapter_images(body):
+    if get_parser() == 'lxml':
+        return lxml_parser.parse_chapter_images(body)
+    return _bs4_parse_chapter_images(body)
+
+def _parse_manga(body):
+    if get_parser() == 'lxml':
+        return lxml_parser.parse_manga(body)
+    return _bs4_parse_manga(body)
+
+def _search_parse_manga(body, results):
+    if get_parser() == 'lxml':
+        return lxml_parser.search_parse_manga(body, results)
+    return _bs4_search_parse_manga(body, results)
+
+def _parse_search_first_page(body, query):
+    """Return results of first page and urls of the next pages"""
+    if get_parser() == 'lxml':
+        return lxml_parser.parse_search_first_page(body, query)
+    return _bs4_parse_search_first_page(body, query)
+
+def _bs4_parse_manga(body):
     # Check if this page is exist
-    if '404 - PAGE NOT FOUND' in r.text:
+    if '404 - PAGE NOT FOUND' in body:
         raise Mangabat404('the page you\'re looking for is not exist')
-    parser = bs4.BeautifulSoup(r.text, 'html.parser')
+    parser = bs4.BeautifulSoup(body, 'html.parser')
 
     data = {}
 
@@ -132,7 +311,7 @@ def _fetch(mangabat_url):
     data['chapters'] = chapters
     return data
 
-def _search_parse_manga(body, results):
+def _bs4_search_parse_manga(body, results):
     parser = bs4.BeautifulSoup(body, 'html.parser')
     rs = parser.find('div', {'class': ['panel-list-story']}).find_all('div', {'class': 'list-story-item'})
     for r in rs:
@@ -183,13 +362,70 @@ def _search_parse_manga(body, results):
 
         results.append(data)
 
-def _search(query):
+def _search(query, session=None, workers=1, max_pages=None, max_results=None):
+    # Reuse one session for all result pages
+    if session is None:
+        with MangabatDownloader(workers) as session:
+            yield from _search(query, session, workers, max_pages, max_results)
+        return
+
+    url = _search_url(query)
+    body = _get_html(url, session)
+    results, pages = _parse_page(session, url, 'search', _parse_search_first_page, body, query)
+
+    def fetch_page(page):
+        n_results = []
+        body = _get_html(page, session)
+        _parse_page(session, page, 'search', _search_parse_manga, body, n_results)
+        return n_results
+
+    yield from _paginate(results, pages, fetch_page, workers, max_pages, max_results)
+
+def _paginate(results, pages, fetch_page, workers=1, max_pages=None, max_results=None):
+    """
+    Yield `results` of the first page, and then results of next `pages`
+    returned by `fetch_page(page)`, up to `workers` pages at the same time in page order.
+
+    With `max_results`, only pages that are needed to reach it are requested,
+    assuming every page has as many results as the first page
+    """
+    if max_pages is not None:
+        pages = pages[:max(max_pages - 1, 0)]
+
+    total = 0
+    for r in results:
+        if max_results is not None and total >= max_results:
+            return
+        total += 1
+        yield r
+
+    if max_results is None:
+        # Fetch up to `workers` pages ahead, but yield them in page order.
+        # Pages after the consumer stopped are never requested
+        for n_results in map_ordered(pages, fetch_page, workers):
+            yield from n_results
+        return
+
+    per_page = max(len(results), 1)
+    index = 0
+    while total < max_results and index < len(pages):
+        # Don't fetch more pages ahead than still needed
+        needed = math.ceil((max_results - total) / per_page)
+        batch = pages[index:index + min(needed, max(workers or 1, 1))]
+        index += len(batch)
+        for n_results in map_ordered(batch, fetch_page, len(batch)):
+            for r in n_results:
+                if total >= max_results:
+                    return
+                total += 1
+                yield r
+
+def _search_url(query):
     alias = convert_query_search(query)
-    url = MANGABAT_SEARCH_URL + urllib.parse.quote(alias)
-    r = requests.get(url)
-    r.raise_for_status()
+    return MANGABAT_SEARCH_URL + urllib.parse.quote(alias)
 
-    parser = bs4.BeautifulSoup(r.text, 'html.parser')
+def _bs4_parse_search_first_page(body, query):
+    parser = bs4.BeautifulSoup(body, 'html.parser')
     results = []
 
     # Check if we're looking for is exist
@@ -216,15 +452,6 @@ def _search(query):
                 pages.append(p.attrs['href'])
 
     # Do parsing in page 1
-    _search_parse_manga(r.text, results)
+    _bs4_search_parse_manga(body, results)
 
-    for r in results:
-        yield r
-
-    # Do parsing in next pages
-    for page in pages:
-        r = requests.get(page)
-        n_results = []
-        _search_parse_manga(r.text, n_results)
-        for r in n_results:
-            yield r
+    return results, pages
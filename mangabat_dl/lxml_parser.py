@@ -0,0 +1,195 @@
+# Faster version of the BeautifulSoup parsers in fetcher.py using lxml.
+# Every function here must return same data as the BeautifulSoup one.
+import html
+import io
+import re
+from datetime import datetime
+from .errors import MangaNotFound, Mangabat404
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+def _has_class(name):
+    # XPath version of BeautifulSoup `{'class': [name]}`
+    return 'contains(concat(" ", normalize-space(@class), " "), " %s ")' % name
+
+def _first(elements):
+    return elements[0] if elements else None
+
+def _decode_contents(element):
+    # Same as BeautifulSoup `Tag.decode_contents()`
+    result = html.escape(element.text or '', quote=False)
+    for child in element:
+        result += lxml.html.tostring(child, encoding='unicode', with_tail=False)
+        result += html.escape(child.tail or '', quote=False)
+    return result
+
+_XPATH_READER_IMAGES = '(//div[%s])[1]//img/@src' % _has_class('container-chapter-reader')
+_XPATH_HOT = '//em[%s]' % _has_class('item-hot')
+_XPATH_INFO = '//td[%s]' % _has_class('table-value')
+_XPATH_VIEWS = '(//i[%s])[1]/../..' % _has_class('info-view')
+_XPATH_UPDATED = '(//i[%s])[1]/../..' % _has_class('info-time')
+_XPATH_STRE_VALUE = './/span[%s]' % _has_class('stre-value')
+_XPATH_COVER = '(//span[%s])[1]' % _has_class('info-image')
+_XPATH_CHAPTERS = '(//ul[%s])[1]//li' % _has_class('row-content-chapter')
+_XPATH_STORY_LIST = '(//div[%s])[1]' % _has_class('panel-list-story')
+_XPATH_STORY_ITEMS = './/div[%s]' % _has_class('list-story-item')
+_XPATH_GROUP_PAGE = '(//div[%s])[1]//a' % _has_class('group-page')
+
+_REGEX_AM_PM = re.compile(r'PM|AM')
+_REGEX_CHAPTER = re.compile(r'chap-[0-9.]{1,}')
+_REGEX_VIEWS = re.compile(r'[0-9,]{1,}')
+
+def parse_chapter_images(body):
+    root = lxml.html.fromstring(body)
+    return [str(i) for i in root.xpath(_XPATH_READER_IMAGES)]
+
+def parse_manga(body):
+    # Check if this page is exist
+    if '404 - PAGE NOT FOUND' in body:
+        raise Mangabat404('the page you\'re looking for is not exist')
+    root = lxml.html.fromstring(body)
+
+    data = {}
+
+    # Finding title
+    data['title'] = _decode_contents(_first(root.xpath('//h1')))
+
+    # Finding absolute url
+    data['url'] = _first(root.xpath('//link[@rel="canonical"]')).get('href')
+
+    # Finding short description
+    data['short_description'] = _first(root.xpath('//meta[@property="og:description"]')).get('content')
+
+    # Finding long description
+    data['long_description'] = _first(root.xpath('//div[@id="panel-story-info-description"]')).text_content()
+
+    # Is this manga is trending / Hot ?
+    data['is_trending'] = bool(root.xpath(_XPATH_HOT))
+
+    # Find init for alt-titles, authors, status, genres
+    _info = root.xpath(_XPATH_INFO)
+
+    # Finding alternative titles
+    at = _decode_contents(_first(_info[0].xpath('.//h2')))
+    if ';' in at:
+        at = [i.strip() for i in io.StringIO(at.replace(';', '\n')).readlines()]
+    else:
+        at = [at]
+    data['alternative_titles'] = at
+
+    # Finding authors
+    data['authors'] = [_decode_contents(i) for i in _info[1].xpath('.//a')]
+
+    # Finding status manga
+    data['status'] = _decode_contents(_info[2])
+
+    # Finding genres
+    data['genres'] = [_decode_contents(i) for i in _info[3].xpath('.//a')]
+
+    # Finding total views
+    views = _first(root.xpath(_XPATH_VIEWS))
+    views = _decode_contents(_first(views.xpath(_XPATH_STRE_VALUE)))
+    data['total_views'] = int(views.replace(',', ''))
+
+    # Finding latest updated
+    updated = _first(root.xpath(_XPATH_UPDATED))
+    date = _decode_contents(_first(updated.xpath(_XPATH_STRE_VALUE)))
+    lu = _REGEX_AM_PM.sub('', date).strip()
+    data['latest_updated'] = datetime.strptime(lu, '%b %d,%Y - %H:%M')
+
+    # Finding cover image
+    cover = _first(root.xpath(_XPATH_COVER))
+    if cover is not None:
+        data['cover_img'] = _first(cover.xpath('.//img')).get('src')
+
+    # Finding chapters
+    chapters = []
+    for element in root.xpath(_XPATH_CHAPTERS):
+        a = _first(element.xpath('.//a'))
+        url = a.get('href')
+        chapters.append({
+            # This is Chapter name
+            'name': _decode_contents(a),
+            # This is chapter number
+            'chapter': float(_REGEX_CHAPTER.search(url).group().replace('chap-', '').strip()),
+            # This is chapter url
+            'url': url
+        })
+
+    # Reverse the chapters as it starts from zero
+    chapters.reverse()
+    data['chapters'] = chapters
+    return data
+
+def _parse_search_results(story_list, results):
+    for r in story_list.xpath(_XPATH_STORY_ITEMS):
+        data = {}
+        # Finding title, and manga url
+        a = _first(r.xpath('.//a'))
+        data['title'] = a.get('title')
+        data['url'] = a.get('href')
+
+        # Finding author
+        at = _first(r.xpath('.//span[%s]' % _has_class('item-author'))).get('title')
+        data['authors'] = [i.strip() for i in io.StringIO(at.replace(',', '\n'))]
+
+        # Finding cover image
+        data['cover_img'] = _first(a.xpath('.//img')).get('src')
+
+        # Is this manga is trending / Hot ?
+        data['is_trending'] = bool(a.xpath('.//em[%s]' % _has_class('item-hot')))
+
+        # Finding rating manga
+        rate = _first(a.xpath('.//em[%s]' % _has_class('item-rate')))
+        data['rating'] = float(_decode_contents(rate))
+
+        # Finding latest chapters
+        data['latest_chapters'] = [
+            {'url': c.get('href'), 'title': c.get('title')}
+            for c in r.xpath('.//a[%s]' % _has_class('item-chapter'))
+        ]
+
+        # Finding latest updated and total view manga
+        _init = r.xpath('.//span[%s]' % _has_class('item-time'))
+
+        # Parsing latest update into datetime object
+        lu = _decode_contents(_init[0])
+        data['latest_updated'] = datetime.strptime(lu, 'Updated : %b %d,%Y - %H:%M')
+
+        # Parsing total view into integer object
+        tv = _decode_contents(_init[1])
+        data['total_views'] = int(_REGEX_VIEWS.search(tv).group().replace(',', ''))
+
+        results.append(data)
+
+def search_parse_manga(body, results):
+    root = lxml.html.fromstring(body)
+    _parse_search_results(_first(root.xpath(_XPATH_STORY_LIST)), results)
+
+def parse_search_first_page(body, query):
+    root = lxml.html.fromstring(body)
+    results = []
+
+    # Check if we're looking for is exist
+    story_list = _first(root.xpath(_XPATH_STORY_LIST))
+    if story_list is None:
+        raise MangaNotFound('manga "%s" cannot be found' % query)
+
+    # Finding pages result
+    pages = []
+    for p in root.xpath(_XPATH_GROUP_PAGE):
+        classes = p.get('class')
+        # Indicating this is pages that we're looking for
+        if classes is None:
+            pages.append(p.get('href'))
+        # Indicating that this is last page
+        elif 'page-last' in classes.split():
+            pages.append(p.get('href'))
+
+    # Do parsing in page 1
+    _parse_search_results(story_list, results)
+
+    return results, pages
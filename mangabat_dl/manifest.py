@@ -0,0 +1,150 @@
+import json
+import os
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from .constants import MANIFEST_FILENAME
+
+log = logging.getLogger('mangabat_dl.downloader')
+
+def _hash_file(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+class Manifest:
+    """
+    Record of downloaded pages in a manga folder.
+
+    Every page is stored by its path relative to manga folder (`<chapter>/<file>`)
+    with url, size, sha256 hash and completion time.
+    Chapters are stored by its folder name after all of the pages are downloaded.
+    If the manifest file is missing, it will be rebuilt from files in the manga folder,
+    the rebuilt pages are not verified until their size is checked to the server.
+
+    Params
+    --------
+    manga_path: :class:`pathlib.Path`
+        Manga folder
+    """
+    def __init__(self, manga_path: Path):
+        self.manga_path = Path(manga_path)
+        self.path = self.manga_path / MANIFEST_FILENAME
+        self._lock = threading.Lock()
+        self._pages = {}
+        self._chapters = {}
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            self.rebuild()
+        except ValueError:
+            log.warning('Manifest "%s" is corrupted, rebuilding...' % (
+                self.path
+            ), extra={"type": 'DOWNLOADER'})
+            self.rebuild()
+        else:
+            self._pages = data.get('pages', {})
+            self._chapters = data.get('chapters', {})
+
+    def rebuild(self):
+        """
+        Rebuild manifest from files in the manga folder.
+
+        The files can be truncated (e.g. written by older version that doesn't use `.part` files),
+        so they are recorded as not verified and :meth:`Manifest.is_complete` is `False`
+        until the downloader checked the size to the server and called :meth:`Manifest.add`
+        """
+        pages = {}
+        if self.manga_path.is_dir():
+            for chapter_path in self.manga_path.iterdir():
+                if not chapter_path.is_dir():
+                    continue
+                for file_path in chapter_path.iterdir():
+                    # Skip unfinished download
+                    if not file_path.is_file() or file_path.suffix in ('.part', '.validator'):
+                        continue
+                    stat = file_path.stat()
+                    # Hashed only after it's verified
+                    pages[self._key(file_path)] = {
+                        "url": None,
+                        "size": stat.st_size,
+                        "hash": None,
+                        "completed": stat.st_mtime,
+                        "verified": False
+                    }
+        # Rebuilt chapters are not trusted as complete too
+        with self._lock:
+            self._pages = pages
+            self._chapters = {}
+            self._dirty = bool(pages)
+
+    def _key(self, file_path: Path) -> str:
+        return '%s/%s' % (file_path.parent.name, file_path.name)
+
+    def is_complete(self, file_path: Path) -> bool:
+        """
+        Check if given file is recorded as complete
+        and still have same size as recorded, without any request to the server
+        """
+        with self._lock:
+            entry = self._pages.get(self._key(file_path))
+        if entry is None:
+            return False
+        # Rebuilt entries from older manifest don't have "verified", but they don't have url too
+        if not entry.get('verified', entry['url'] is not None):
+            return False
+        try:
+            return os.stat(file_path).st_size == entry['size']
+        except FileNotFoundError:
+            return False
+
+    def add(self, file_path: Path, url: str, size: int, hash: str=None):
+        """Record given file as complete"""
+        if hash is None:
+            hash = _hash_file(file_path)
+        with self._lock:
+            self._pages[self._key(file_path)] = {
+                "url": url,
+                "size": size,
+                "hash": hash,
+                "completed": time.time(),
+                "verified": True
+            }
+            self._dirty = True
+
+    def is_chapter_complete(self, chapter_path: Path) -> bool:
+        """Check if all pages of given chapter folder is recorded as complete"""
+        with self._lock:
+            return Path(chapter_path).name in self._chapters
+
+    def add_chapter(self, chapter_path: Path, url: str, pages: int):
+        """Record given chapter folder as complete"""
+        with self._lock:
+            self._chapters[Path(chapter_path).name] = {
+                "url": url,
+                "pages": pages,
+                "completed": time.time()
+            }
+            self._dirty = True
+
+    def save(self):
+        """Write manifest to the manga folder, if there is any changes"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps({"chapters": self._chapters, "pages": self._pages})
+            self._dirty = False
+        self.manga_path.mkdir(parents=True, exist_ok=True)
+        # Write to temporary file and then rename it,
+        # so the manifest is never half-written
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        tmp_path.write_text(data)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,191 @@
+import bisect
+import threading
+from typing import List
+from .events import Events
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ''
+    return '{%s}' % ','.join(
+        '%s="%s"' % (key, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+        for key, value in sorted(labels.items())
+    )
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value: float=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def get(self, **labels) -> float:
+        return self._values.get(tuple(sorted(labels.items())), 0)
+
+    def export(self) -> List[str]:
+        lines = [
+            '# HELP %s %s' % (self.name, self.help),
+            '# TYPE %s counter' % self.name
+        ]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append('%s%s %s' % (self.name, _format_labels(dict(key)), _format_value(value)))
+        return lines
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: List[float]):
+        self.name = name
+        self.help = help
+        self.buckets = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+    def export(self) -> List[str]:
+        lines = [
+            '# HELP %s %s' % (self.name, self.help),
+            '# TYPE %s histogram' % self.name
+        ]
+        with self._lock:
+            total = 0
+            for bound, count in zip(self.buckets + [float('inf')], self._counts):
+                total += count
+                lines.append('%s_bucket{le="%s"} %s' % (self.name, _format_value(float(bound)), total))
+            lines.append('%s_sum %s' % (self.name, _format_value(float(self._sum))))
+            lines.append('%s_count %s' % (self.name, self._count))
+        return lines
+
+class Metrics:
+    """
+    Counters and histograms of downloads, collected from :class:`Events`.
+
+    Example ::
+
+        metrics = Metrics(session.events)
+        manga.download(session=session)
+        print(metrics.export())
+
+    Params
+    --------
+    events: :class:`Events` (Optional)
+        Start collecting from given events, see :meth:`Metrics.attach`
+    """
+    def __init__(self, events: Events=None):
+        self.pages = Counter('mangabat_pages_total', 'Pages by result (done, skipped, failed)')
+        self.chapters = Counter('mangabat_chapters_total', 'Chapters by result (done, failed)')
+        self.bytes = Counter('mangabat_bytes_received_total', 'Bytes of pages received')
+        self.requests = Counter('mangabat_requests_total', 'HTTP requests by status code')
+        self.retries = Counter('mangabat_retries_total', 'Retried requests and downloads')
+        self.request_duration = Histogram(
+            'mangabat_request_duration_seconds',
+            'Time until response headers are received',
+            [0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+        )
+        self.parse_duration = Histogram(
+            'mangabat_parse_duration_seconds',
+            'Time to parse manga, chapter and search pages',
+            [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1]
+        )
+        self.page_speed = Histogram(
+            'mangabat_page_bytes_per_second',
+            'Download speed of every page',
+            [2 ** i * 1024 for i in range(6, 17, 2)]
+        )
+        self._events = []
+        if events is not None:
+            self.attach(events)
+
+    def attach(self, events: Events):
+        """Start collecting from given events"""
+        events.on('page_done', self._page_done)
+        events.on('bytes_received', self._bytes_received)
+        events.on('chapter_done', self._chapter_done)
+        events.on('retry', self._retry)
+        events.on('error', self._error)
+        events.on('request', self._request)
+        events.on('parse', self._parse)
+        self._events.append(events)
+
+    def detach(self):
+        """Stop collecting from all attached events"""
+        for events in self._events:
+            events.off('page_done', self._page_done)
+            events.off('bytes_received', self._bytes_received)
+            events.off('chapter_done', self._chapter_done)
+            events.off('retry', self._retry)
+            events.off('error', self._error)
+            events.off('request', self._request)
+            events.off('parse', self._parse)
+        self._events = []
+
+    def _page_done(self, size, skipped, duration, **kwargs):
+        if skipped:
+            self.pages.inc(result='skipped')
+            return
+        self.pages.inc(result='done')
+        if duration > 0:
+            self.page_speed.observe(size / duration)
+
+    def _bytes_received(self, size, **kwargs):
+        self.bytes.inc(size)
+
+    def _chapter_done(self, failed, **kwargs):
+        self.chapters.inc(result='failed' if failed else 'done')
+
+    def _retry(self, **kwargs):
+        self.retries.inc()
+
+    def _error(self, **kwargs):
+        self.pages.inc(result='failed')
+
+    def _request(self, status, duration, **kwargs):
+        self.requests.inc(status=status)
+        self.request_duration.observe(duration)
+
+    def _parse(self, kind, duration, **kwargs):
+        self.parse_duration.observe(duration)
+
+    def export(self) -> str:
+        """
+        Export all metrics in Prometheus text format
+
+        return :class:`str`
+        """
+        lines = []
+        for metric in (
+            self.pages,
+            self.chapters,
+            self.bytes,
+            self.requests,
+            self.retries,
+            self.request_duration,
+            self.parse_duration,
+            self.page_speed
+        ):
+            lines.extend(metric.export())
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,92 @@
+import collections
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Generator, Iterable
+
+_END = object()
+
+def prefetch(
+    iterable: Iterable,
+    func: Callable[[Any], Any],
+    size: int=1
+) -> Generator[Any, Any, Any]:
+    """
+    Call `func` to every item of `iterable` in background thread
+    and yield the item when it's done, up to `size` items ahead of the consumer.
+
+    If `func` is raising error, it will be re-raised in the consumer
+    when it reach that item.
+    """
+    q = queue.Queue(maxsize=max(size, 1))
+    stopped = threading.Event()
+
+    def put(value):
+        # Don't block forever if the consumer has stopped
+        while not stopped.is_set():
+            try:
+                q.put(value, timeout=0.1)
+            except queue.Full:
+                continue
+            else:
+                return True
+        return False
+
+    def producer():
+        for item in iterable:
+            if stopped.is_set():
+                return
+            try:
+                func(item)
+            except Exception as e:
+                if not put((item, e)):
+                    return
+            else:
+                if not put((item, None)):
+                    return
+        put(_END)
+
+    thread = threading.Thread(target=producer, daemon=True)
+    thread.start()
+    try:
+        while True:
+            value = q.get()
+            if value is _END:
+                break
+            item, error = value
+            if error is not None:
+                raise error
+            yield item
+    finally:
+        stopped.set()
+
+def map_ordered(
+    iterable: Iterable,
+    func: Callable[[Any], Any],
+    workers: int=1
+) -> Generator[Any, Any, Any]:
+    """
+    Same as :func:`map`, but `func` is called in up to `workers` threads
+    ahead of the consumer. Results are yielded in the same order as `iterable`
+    and items after the consumer has stopped are never called.
+    """
+    if workers is None or workers <= 1:
+        for item in iterable:
+            yield func(item)
+        return
+
+    iterator = iter(iterable)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = collections.deque(
+            executor.submit(func, item) for item in itertools.islice(iterator, workers)
+        )
+        try:
+            while futures:
+                result = futures.popleft().result()
+                for item in itertools.islice(iterator, 1):
+                    futures.append(executor.submit(func, item))
+                yield result
+        finally:
+            for future in futures:
+                future.cancel()
@@ -0,0 +1,79 @@
+import threading
+import tqdm
+from .events import Events
+
+class ProgressBar:
+    """
+    One progress bar for all pages of a manga (or a chapter),
+    instead of one progress bar for every page
+
+    Params
+    --------
+    events: :class:`Events`
+        Events of the session that download the manga
+    manga: :class:`Manga`
+        Only pages of this manga is counted
+    chapter: :class:`float` (Optional)
+        Only pages of this chapter is counted
+    """
+    def __init__(self, events: Events, manga, chapter: float=None):
+        self.events = events
+        self.manga = manga
+        self.chapter = chapter
+        self.pages = 0
+        self.skipped = 0
+        self._lock = threading.Lock()
+        if chapter is None:
+            desc = manga.title
+        else:
+            desc = '%s Chapter %s' % (manga.title, chapter)
+        self._bar = tqdm.tqdm(
+            desc=desc,
+            total=0,
+            unit='B',
+            unit_scale=True,
+            ncols=80
+        )
+        events.on('page_started', self._page_started)
+        events.on('bytes_received', self._bytes_received)
+        events.on('page_done', self._page_done)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _match(self, manga, chapter) -> bool:
+        if manga is not self.manga:
+            return False
+        return self.chapter is None or chapter == self.chapter
+
+    def _page_started(self, manga, chapter, size, offset, **kwargs):
+        if not self._match(manga, chapter):
+            return
+        with self._lock:
+            # Total size is known after every page is started
+            self._bar.total += size
+            self._bar.update(offset)
+
+    def _bytes_received(self, manga, chapter, size, **kwargs):
+        if not self._match(manga, chapter):
+            return
+        with self._lock:
+            self._bar.update(size)
+
+    def _page_done(self, manga, chapter, skipped, **kwargs):
+        if not self._match(manga, chapter):
+            return
+        with self._lock:
+            self.pages += 1
+            if skipped:
+                self.skipped += 1
+            self._bar.set_postfix_str('%s pages' % self.pages, refresh=False)
+
+    def close(self):
+        self.events.off('page_started', self._page_started)
+        self.events.off('bytes_received', self._bytes_received)
+        self.events.off('page_done', self._page_done)
+        self._bar.close()
@@ -0,0 +1,74 @@
+import time
+import threading
+import urllib.parse
+
+class TokenBucket:
+    """
+    Allow `rate` operations per second on average
+    with bursts up to `capacity` operations
+
+    Params
+    --------
+    rate: :class:`float`
+        Number of tokens added per second
+    capacity: :class:`float` (Optional)
+        Maximum number of tokens, default to `rate`
+    """
+    def __init__(self, rate: float, capacity: float=None):
+        if rate <= 0:
+            raise ValueError('rate must be more than 0')
+        self.rate = rate
+        self.capacity = max(capacity or rate, 1)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        # Take 1 token and return seconds to wait until it's available
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity,
+                self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Block until 1 token is available"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+class RateLimiter:
+    """
+    Limit requests per second for each host
+
+    Params
+    --------
+    rate: :class:`float`
+        Number of requests per second for each host
+    burst: :class:`float` (Optional)
+        Maximum number of requests sent at once, default to `rate`
+    """
+    def __init__(self, rate: float, burst: float=None):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _get_bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def acquire(self, url: str):
+        """Block until request to given url is allowed"""
+        host = urllib.parse.urlsplit(url).netloc
+        self._get_bucket(host).acquire()
@@ -0,0 +1,72 @@
+import random
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+class RetryPolicy:
+    """
+    Decide when and how long to wait before retrying failed request
+
+    Params
+    --------
+    total: :class:`int` (Optional, default: `3`)
+        Maximum number of retries, `0` means no retry
+    backoff_factor: :class:`float` (Optional, default: `0.5`)
+        Wait `backoff_factor * (2 ** attempt)` seconds before next retry
+    max_backoff: :class:`float` (Optional, default: `60`)
+        Maximum seconds to wait before next retry
+    jitter: :class:`bool` (Optional, default: `True`)
+        Randomize the wait time,
+        so multiple workers doesn't retry at the same time
+    status_forcelist: :class:`tuple` (Optional)
+        HTTP status codes that should be retried
+    respect_retry_after: :class:`bool` (Optional, default: `True`)
+        Use the `Retry-After` header from the server if it's available
+    """
+    def __init__(
+        self,
+        total: int=3,
+        backoff_factor: float=0.5,
+        max_backoff: float=60,
+        jitter: bool=True,
+        status_forcelist: tuple=(429, 500, 502, 503, 504),
+        respect_retry_after: bool=True
+    ):
+        self.total = total
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.status_forcelist = status_forcelist
+        self.respect_retry_after = respect_retry_after
+
+    def can_retry(self, attempt: int) -> bool:
+        return attempt < self.total
+
+    def is_retryable_status(self, status_code: int) -> bool:
+        return status_code in self.status_forcelist
+
+    def _parse_retry_after(self, value: str) -> float:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if date.tzinfo is None:
+            date = date.replace(tzinfo=timezone.utc)
+        return (date - datetime.now(timezone.utc)).total_seconds()
+
+    def get_backoff(self, attempt: int, headers: dict=None) -> float:
+        """Get seconds to wait before retrying given attempt (starts from `0`)"""
+        if self.respect_retry_after and headers is not None:
+            retry_after = headers.get('Retry-After')
+            if retry_after is not None:
+                seconds = self._parse_retry_after(retry_after)
+                if seconds is not None:
+                    return min(max(seconds, 0), self.max_backoff)
+
+        backoff = min(self.backoff_factor * (2 ** attempt), self.max_backoff)
+        if self.jitter:
+            backoff = random.uniform(0, backoff)
+        return backoff
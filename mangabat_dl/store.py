@@ -0,0 +1,86 @@
+import os
+import logging
+import threading
+from pathlib import Path
+
+log = logging.getLogger('mangabat_dl.downloader')
+
+def _link(src: Path, dst: Path):
+    # Already linked, renaming a link over another link
+    # to the same file does nothing and leave the temporary file behind
+    try:
+        if os.path.samefile(src, dst):
+            return
+    except FileNotFoundError:
+        pass
+    # Link to temporary name and then rename it,
+    # so existing `dst` is replaced in one step
+    tmp_path = dst.with_name('%s.%s.%s.link' % (dst.name, os.getpid(), threading.get_ident()))
+    os.link(src, tmp_path)
+    os.replace(tmp_path, dst)
+
+class ImageStore:
+    """
+    Content-addressed store for downloaded pages.
+
+    Every image is stored once as `<path>/<hash[:2]>/<hash>`,
+    and the page files are hardlinks to it. So same image in many chapters
+    and manga (credits pages, covers, etc) is only stored once.
+
+    The store must be in the same filesystem as the download folder,
+    if hardlink is not possible, the page is stored as normal file.
+
+    Params
+    --------
+    path: :class:`str`
+        Folder where the images is stored
+    """
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.saved = 0
+
+    def get_path(self, hash: str) -> Path:
+        """Get path of the image which have given sha256 hash"""
+        return self.path / hash[:2] / hash
+
+    def add(self, part_path: Path, file_path: Path, hash: str):
+        """
+        Move downloaded file `part_path` to `file_path`
+        and link it with the image in the store
+        """
+        blob_path = self.get_path(hash)
+        blob_path.parent.mkdir(exist_ok=True)
+        size = os.stat(part_path).st_size
+
+        # New image, the downloaded file become the stored image
+        try:
+            os.link(part_path, blob_path)
+        except FileExistsError:
+            pass
+        except OSError as e:
+            log.warning('Cannot link "%s" to the image store (%s), storing it as normal file' % (
+                file_path,
+                e
+            ), extra={"type": 'DOWNLOADER'})
+            os.replace(part_path, file_path)
+            return
+        else:
+            os.replace(part_path, file_path)
+            return
+
+        # Same image is already stored, use it instead of downloaded file
+        if os.stat(blob_path).st_size != size:
+            # Stored image is broken, replace it with downloaded file
+            _link(part_path, blob_path)
+            os.replace(part_path, file_path)
+            return
+
+        _link(blob_path, file_path)
+        os.remove(part_path)
+        with self._lock:
+            self.saved += size
+        log.info('"%s" is already in the image store, linked it' % (
+            file_path
+        ), extra={"type": 'DOWNLOADER'})
@@ -1,5 +1,7 @@
+import bisect
+import functools
 import re
-from typing import Any
+from typing import Any, List, Optional, Tuple
 
 class ContextVar:
     """
@@ -50,91 +52,111 @@ class StringVar:
 #     str = str.replace(/^\_+|\_+$/g, "");
 #     return str;
 # }
+_ALIAS_CHARACTERS = {
+    'a': 'àáạảãâầấậẩẫăằắặẳẵ',
+    'e': 'èéẹẻẽêềếệểễ',
+    'i': 'ìíịỉĩ',
+    'o': 'òóọỏõôồốộổỗơờớợởỡ',
+    'u': 'ùúụủũưừứựửữ',
+    'y': 'ỳýỵỷỹ',
+    'd': 'đ',
+    '_': ' '
+}
+_ALIAS_TABLE = str.maketrans({
+    char: replacer
+    for replacer, chars in _ALIAS_CHARACTERS.items()
+    for char in chars
+})
+# Every run of symbols become one "_", so "_+_" doesn't need to be replaced anymore
+_REGEX_ALIAS_SYMBOLS = re.compile(r'[^0-9a-z\s]+', re.IGNORECASE)
+_REGEX_ALIAS_ENDS = re.compile(r'^\_+|\_+$')
+
 def convert_query_search(query_search: str):
     """
     Convert query search into readable alias
     based on mangabat Javascript `change_alias()` function
     """
-    string = query_search.lower()
-    REGEXS_CONVERT_ALIAS = [
-        [
-            re.compile(r'à|á|ạ|ả|ã|â|ầ|ấ|ậ|ẩ|ẫ|ă|ằ|ắ|ặ|ẳ|ẵ'),
-            "a"
-        ],
-        [
-            re.compile(r'è|é|ẹ|ẻ|ẽ|ê|ề|ế|ệ|ể|ễ'),
-            "e"
-        ],
-        [
-            re.compile(r'ì|í|ị|ỉ|ĩ'),
-            "i"
-        ],
-        [
-            re.compile(r'ò|ó|ọ|ỏ|õ|ô|ồ|ố|ộ|ổ|ỗ|ơ|ờ|ớ|ợ|ở|ỡ'),
-            "o"
-        ],
-        [
-            re.compile(r'ù|ú|ụ|ủ|ũ|ư|ừ|ứ|ự|ử|ữ'),
-            "u"
-        ],
-        [
-            re.compile(r'ỳ|ý|ỵ|ỷ|ỹ'),
-            "y"
-        ],
-        [
-            re.compile(r'đ'),
-            "d"
-        ],
-        [
-            re.compile(r' '),
-            "_"
-        ],
-        [
-            re.compile(r'[^0-9a-z\s]', re.IGNORECASE),
-            '_'
-        ],
-        [
-            re.compile(r'_+_'),
-            '_'
-        ],
-        [
-            re.compile(r'^\_+|\_+$'),
-            ''
-        ]
-    ]
-    alias = ContextVar(string)
-    for context in REGEXS_CONVERT_ALIAS:
-        regex = context[0]
-        replacer = context[1]
-        result = regex.sub(replacer, alias.get())
-        alias.set(result)
-    return alias.get()
+    alias = query_search.lower().translate(_ALIAS_TABLE)
+    alias = _REGEX_ALIAS_SYMBOLS.sub('_', alias)
+    return _REGEX_ALIAS_ENDS.sub('', alias)
 
 # Adapted from
 # https://github.com/mansuf/mangadex-downloader/blob/v0.0.5/mangadex_downloader/constants.py#L129
+_FORBIDDEN_NAMES_TABLE = str.maketrans('', '', ''.join([
+    # Unix
+    '/',
+    # Mac OS
+    ':',
+    # Windows
+    '<>:"/\\|?*'
+]))
+
+@functools.lru_cache(maxsize=1024)
 def filter_forbidden_names(string: str):
     """Filter symbol names to prevent error when creating folder or file"""
-    result = ''
-    UNIX_FORBIDDEN_NAMES = ['/']
-    MAC_OS_FORBIDDEN_NAMES = [':']
-    WINDOWS_FORBIDDEN_NAMES = ['<', '>', ':', '\"', '/', '\\', '|', '?', '*']
-    for word in string:
-        if word in UNIX_FORBIDDEN_NAMES:
-            continue
-        elif word in MAC_OS_FORBIDDEN_NAMES:
-            continue
-        elif word in WINDOWS_FORBIDDEN_NAMES:
-            continue
-        else:
-            result += word
-    final = StringVar(result)
     # remove dot or space in ends words
     # to prevent error when writing file or folder in windows
-    while True:
-        ctx = final.get()
-        if ctx[len(ctx) - 1] == '.' or ctx[len(ctx) - 1] == ' ':
-            r = ctx[0:len(ctx) - 1]
-            final.set(r)
-        else:
-            break
-    return final.get()
\ No newline at end of file
+    return string.translate(_FORBIDDEN_NAMES_TABLE).rstrip('. ')
+
+def parse_range(spec: str) -> List[Tuple[Optional[float], Optional[float]]]:
+    """
+    Parse range like `1-10,15,20-` into list of `(start, end)`,
+    `None` means no limit in that side
+
+    Raise :class:`ValueError` if `spec` is not valid
+    """
+    ranges = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        start, sep, end = part.partition('-')
+        try:
+            start = float(start) if start.strip() else None
+            end = float(end) if end.strip() else None
+        except ValueError:
+            raise ValueError('"%s" is not valid range' % part) from None
+        if not sep:
+            # Single number
+            end = start
+        elif start is None and end is None:
+            raise ValueError('"%s" is not valid range' % part)
+        if start is not None and end is not None and start > end:
+            raise ValueError('"%s" is not valid range, %s is more than %s' % (part, start, end))
+        ranges.append((start, end))
+    if not ranges:
+        raise ValueError('"%s" is not valid range' % spec)
+    return ranges
+
+def select_range(
+    numbers: List[float],
+    start: float=None,
+    end: float=None,
+    ranges: List[Tuple[Optional[float], Optional[float]]]=None
+) -> List[int]:
+    """
+    Get indexes of `numbers` (must be sorted) between `start` and `end`
+    and inside any of `ranges` (see :func:`parse_range`), found by binary search
+    """
+    if ranges is None:
+        ranges = [(None, None)]
+    spans = []
+    for lo, hi in ranges:
+        if start is not None:
+            lo = start if lo is None else max(lo, start)
+        if end is not None:
+            hi = end if hi is None else min(hi, end)
+        lo = 0 if lo is None else bisect.bisect_left(numbers, lo)
+        hi = len(numbers) if hi is None else bisect.bisect_right(numbers, hi)
+        if lo < hi:
+            spans.append((lo, hi))
+
+    # Merge overlapping ranges, so every index is selected once
+    indexes = []
+    last = 0
+    for lo, hi in sorted(spans):
+        lo = max(lo, last)
+        if lo < hi:
+            indexes.extend(range(lo, hi))
+            last = hi
+    return indexes
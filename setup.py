@@ -35,17 +35,20 @@ setup(
           'bs4',
           'tqdm',
       ],
+  extras_require={
+    'async': ['aiohttp'],
+    'lxml': ['lxml'],
+  },
   classifiers=[
     'Development Status :: 3 - Alpha',
     'Intended Audience :: Developers',
     'Intended Audience :: End Users/Desktop',
     'License :: OSI Approved :: The Unlicense (Unlicense)',  
     'Programming Language :: Python :: 3',
-    'Programming Language :: Python :: 3.5',
     'Programming Language :: Python :: 3.6',
     'Programming Language :: Python :: 3.7',
     'Programming Language :: Python :: 3.8',
     'Programming Language :: Python :: 3.9'
   ],
-  python_requires='>=3.5'
+  python_requires='>=3.6'
 )
\ No newline at end of file